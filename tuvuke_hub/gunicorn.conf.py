@@ -0,0 +1,22 @@
+"""
+Gunicorn configuration, read automatically when gunicorn starts in this
+directory (see startCommand in render.yaml).
+"""
+
+import os
+
+# Import Django once in the master; workers share those pages copy-on-write
+preload_app = True
+
+# WEB_CONCURRENCY is the usual knob on Render and similar hosts
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+
+# Threads let a worker keep serving while other requests wait on the
+# database, Redis or SMS gateway
+worker_class = 'gthread'
+threads = int(os.environ.get('GUNICORN_THREADS', 4))
+
+# Recycle workers now and then to cap slow memory growth; the jitter keeps
+# them from all restarting at once
+max_requests = 1000
+max_requests_jitter = 100
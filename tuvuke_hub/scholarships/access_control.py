@@ -5,8 +5,10 @@ Implements role-based access control for different user types
 
 from functools import wraps
 from django.contrib.auth.decorators import login_required, user_passes_test
+from django.contrib.auth.models import User
 from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
 from django.core.exceptions import PermissionDenied
+from django.db.models import Exists, OuterRef
 from django.shortcuts import redirect
 from django.contrib import messages
 from django.urls import reverse_lazy
@@ -18,6 +20,28 @@ from .models import Student, Provider
 # UTILITY FUNCTIONS FOR USER ROLE CHECKING
 # =====================================================================
 
+def get_student_profile(user):
+    """
+    Get the user's Student profile with its county in a single query.
+    
+    The profile is cached on the user, so later `user.student_profile`
+    accesses during the same request don't query again.
+    
+    Args:
+        user: Django User object
+        
+    Returns:
+        Student: The user's profile, or None if the user has no student
+            profile (the miss is cached too, without raising)
+    """
+    if User.student_profile.is_cached(user):
+        return getattr(user, 'student_profile', None)
+    
+    student = Student.objects.select_related('county').filter(user=user).first()
+    User.student_profile.related.set_cached_value(user, student)
+    return student
+
+
 def is_student(user):
     """
     Check if user is a student (has Student profile)
@@ -31,10 +55,7 @@ def is_student(user):
     if not user or not user.is_authenticated:
         return False
     
-    try:
-        return hasattr(user, 'student_profile') and user.student_profile is not None
-    except Exception:
-        return False
+    return get_student_profile(user) is not None
 
 
 def is_provider(user):
@@ -50,13 +71,20 @@ def is_provider(user):
     if not user or not user.is_authenticated:
         return False
     
+    # Remembered on the user object, i.e. for the rest of the request: the
+    # role context processor, access decorators and redirects all ask again
+    if hasattr(user, '_is_provider'):
+        return user._is_provider
+    
     try:
         # Check if user has provider access via Provider model
         # This assumes providers have special group membership or staff status
-        return (user.is_staff and 
-                Provider.objects.filter(email=user.email).exists()) or user.groups.filter(name='Providers').exists()
+        result = (user.is_staff and 
+                  Provider.objects.filter(email=user.email).exists()) or user.groups.filter(name='Providers').exists()
     except Exception:
-        return False
+        result = False
+    user._is_provider = result
+    return result
 
 
 def is_staff_or_admin(user):
@@ -75,6 +103,76 @@ def is_staff_or_admin(user):
     return user.is_staff or user.is_superuser
 
 
+def get_role(user):
+    """
+    Get the user's main role, with one query for all role checks.
+    
+    Roles are checked in the same order as the dashboards pick them:
+    student, then provider, then staff. The result is remembered on the
+    user object for the rest of the request.
+    
+    Args:
+        user: Django User object
+        
+    Returns:
+        str: 'student', 'provider' or 'staff', or None for anonymous users
+            and users without a role
+    """
+    if not user or not user.is_authenticated:
+        return None
+    if hasattr(user, '_role'):
+        return user._role
+    
+    flags = User.objects.filter(pk=user.pk).annotate(
+        has_student=Exists(Student.objects.filter(user=OuterRef('pk'))),
+        has_provider=Exists(Provider.objects.filter(email=OuterRef('email'))),
+        in_providers_group=Exists(
+            User.groups.through.objects.filter(user=OuterRef('pk'), group__name='Providers')
+        ),
+    ).values('has_student', 'has_provider', 'in_providers_group').first() or {}
+    
+    if flags.get('has_student'):
+        role = 'student'
+    else:
+        # Same rule as is_provider, which can now answer without a query
+        user._is_provider = bool(
+            (user.is_staff and flags.get('has_provider')) or flags.get('in_providers_group')
+        )
+        if user._is_provider:
+            role = 'provider'
+        elif is_staff_or_admin(user):
+            role = 'staff'
+        else:
+            role = None
+    user._role = role
+    return role
+
+
+# Session key holding the role resolved when the user logged in
+ROLE_SESSION_KEY = 'user_role'
+
+
+def get_request_role(request):
+    """
+    Get the role of the logged-in user from their session.
+    
+    The role is stored in the session at login (see signals.py), so reading
+    it needs no query. Sessions from before that fall back to get_role().
+    
+    Args:
+        request: Django HttpRequest object
+        
+    Returns:
+        str: 'student', 'provider' or 'staff', or None when there is no role
+    """
+    if not request.user.is_authenticated:
+        return None
+    role = request.session.get(ROLE_SESSION_KEY)
+    if role is None:
+        role = request.session[ROLE_SESSION_KEY] = get_role(request.user) or ''
+    return role or None
+
+
 def is_verified_student(user):
     """
     Check if user is a verified student
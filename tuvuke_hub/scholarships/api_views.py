@@ -4,8 +4,13 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
+from django.core.cache import cache
+from django.db.models import Count, Max, Sum
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
+from django.utils.cache import get_conditional_response, quote_etag
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_page
 
 from .models import Scholarship, Application, Student
 from .serializers import (
@@ -14,8 +19,43 @@ from .serializers import (
     ApplicationSubmitSerializer
 )
 from .filters import ScholarshipFilter, ApplicationFilter
+from .recommendations import current_version
 
+# Scholarship lists are the same for every visitor and change rarely
+SCHOLARSHIP_LIST_CACHE_TIMEOUT = 60
 
+# Eligibility only changes with the student or the scholarship, and both
+# are part of the cache key
+ELIGIBILITY_CACHE_TIMEOUT = 60 * 60
+
+
+def scholarship_list_etag(queryset):
+    """
+    ETag for a filtered scholarship list, from one aggregate query.
+
+    The view and application counters are saved with update_fields, which
+    leaves updated_at alone, so their totals are part of the tag.
+
+    Args:
+        queryset: The filtered scholarships the list would render
+
+    Returns:
+        str: Quoted ETag value
+    """
+    state = queryset.order_by().aggregate(
+        total=Count('id'),
+        latest=Max('updated_at'),
+        provider_latest=Max('provider__updated_at'),
+        views=Sum('view_count'),
+        applications=Sum('application_count'),
+    )
+    return quote_etag('-'.join(
+        str(value.timestamp() if hasattr(value, 'timestamp') else value)
+        for value in state.values()
+    ))
+
+
+@method_decorator(cache_page(SCHOLARSHIP_LIST_CACHE_TIMEOUT), name='list')
 class ScholarshipViewSet(viewsets.ReadOnlyModelViewSet):
     """
     ViewSet for Scholarship model
@@ -48,6 +88,17 @@ class ScholarshipViewSet(viewsets.ReadOnlyModelViewSet):
             return ScholarshipDetailSerializer
         return ScholarshipListSerializer
     
+    def list(self, request, *args, **kwargs):
+        """Answer with 304 Not Modified when the client's copy is current"""
+        etag = scholarship_list_etag(self.filter_queryset(self.get_queryset()))
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+        
+        response = super().list(request, *args, **kwargs)
+        response['ETag'] = etag
+        return response
+    
     def retrieve(self, request, *args, **kwargs):
         """Override retrieve to increment view count"""
         instance = self.get_object()
@@ -75,25 +126,44 @@ class ScholarshipViewSet(viewsets.ReadOnlyModelViewSet):
             )
         
         scholarship = self.get_object()
-        match_score = scholarship.calculate_match_score(student)
+        # The scholarship side of the key is the recommendations version,
+        # which moves on every scholarship edit including target counties
+        cache_key = (
+            f'eligibility:v{current_version()}:{student.id}:{scholarship.id}:'
+            f'{student.updated_at.timestamp()}'
+        )
+        eligibility = cache.get_or_set(
+            cache_key,
+            lambda: self._compute_eligibility(student, scholarship),
+            ELIGIBILITY_CACHE_TIMEOUT
+        )
         
-        # Check if already applied
+        # Check if already applied; applying does not change the key above
         has_applied = Application.objects.filter(
             student=student, 
             scholarship=scholarship
         ).exists()
         
         return Response({
-            'match_score': match_score,
+            'match_score': eligibility['match_score'],
             'has_applied': has_applied,
+            'is_eligible': eligibility['is_eligible'],
+            'eligibility_details': eligibility['eligibility_details'],
+        })
+    
+    def _compute_eligibility(self, student, scholarship):
+        """Match score and per-requirement results for a student"""
+        match_score = scholarship.calculate_match_score(student)
+        return {
+            'match_score': match_score,
             'is_eligible': match_score > 0,
             'eligibility_details': {
                 'education_level_match': student.current_education_level in scholarship.target_education_levels,
                 'age_requirements_met': self._check_age_requirements(student, scholarship),
                 'gender_requirements_met': self._check_gender_requirements(student, scholarship),
-                'county_match': scholarship.target_counties.filter(id=student.county_id).exists() if student.county else True,
+                'county_match': scholarship.target_counties.filter(id=student.county_id).exists() if student.county_id else True,
             }
-        })
+        }
     
     def _check_age_requirements(self, student, scholarship):
         """Check if student meets age requirements"""
@@ -134,9 +204,11 @@ class ApplicationViewSet(viewsets.ModelViewSet):
         """Return only the authenticated student's applications"""
         try:
             student = self.request.user.student_profile
+            # The serializer nests the student's county and each scholarship's
+            # provider and target counties, so load them up front
             return Application.objects.filter(student=student).select_related(
-                'scholarship', 'scholarship__provider'
-            )
+                'student__county', 'scholarship__provider'
+            ).prefetch_related('scholarship__target_counties')
         except Student.DoesNotExist:
             return Application.objects.none()
     
@@ -18,7 +18,7 @@ from django.views.decorators.http import require_http_methods
 
 from .auth_forms import PhoneNumberLoginForm, StudentPhoneRegistrationForm, PasswordResetByPhoneForm
 from .access_control import (
-    is_student, is_provider, is_staff_or_admin,
+    get_role, is_student,
     student_required, provider_required, staff_required
 )
 from .models import Student
@@ -82,11 +82,12 @@ class CustomLoginView(FormView):
             return next_url
         
         # Role-based redirection
-        if is_student(user):
+        role = get_role(user)
+        if role == 'student':
             return reverse_lazy('scholarships:student_dashboard')
-        elif is_provider(user):
+        elif role == 'provider':
             return reverse_lazy('scholarships:provider_dashboard')
-        elif is_staff_or_admin(user):
+        elif role == 'staff':
             return reverse_lazy('admin:index')
         else:
             return reverse_lazy('home')
@@ -107,7 +108,7 @@ def custom_logout_view(request):
     """
     if request.user.is_authenticated:
         user_name = request.user.get_full_name() or request.user.username
-        user_role = 'student' if is_student(request.user) else 'provider' if is_provider(request.user) else 'user'
+        user_role = get_role(request.user) or 'user'
         
         logout(request)
         
@@ -5,8 +5,12 @@ Custom authentication backends for TUVUKE Hub
 from django.contrib.auth.backends import BaseBackend
 from django.contrib.auth.models import User
 from django.db.models import Q
+from django.db.models.functions import Lower
 from .models import Student, Provider
 
+# Characters people type between the digits of a phone number
+PHONE_SEPARATORS = str.maketrans('', '', ' -().\t')
+
 
 class PhoneNumberAuthBackend(BaseBackend):
     """
@@ -91,8 +95,12 @@ class PhoneNumberAuthBackend(BaseBackend):
         if not phone_number:
             return None
         
-        # Remove all non-digit characters except +
-        cleaned = ''.join(char for char in phone_number if char.isdigit() or char == '+')
+        # Drop separators in one C-level pass; anything else that is not a
+        # digit (after an optional leading +) means it is not a phone number
+        cleaned = phone_number.translate(PHONE_SEPARATORS)
+        digits = cleaned[1:] if cleaned.startswith('+') else cleaned
+        if not (digits.isascii() and digits.isdigit()):
+            return None
         
         # Handle different formats
         if cleaned.startswith('+254'):
@@ -157,32 +165,50 @@ class MultiFieldAuthBackend(BaseBackend):
     def authenticate(self, request, username=None, password=None, **kwargs):
         """
         Authenticate user using username, email, or phone number
+        
+        The account is found with a single query, so the password hash is
+        checked once per matching account rather than once per lookup kind.
         """
         if username is None or password is None:
             return None
         
-        # Try phone number authentication first
-        phone_backend = PhoneNumberAuthBackend()
-        user = phone_backend.authenticate(request, username, password, **kwargs)
-        if user:
-            return user
-        
-        # Try email authentication
-        email_backend = EmailAuthBackend()
-        user = email_backend.authenticate(request, username, password, **kwargs)
-        if user:
-            return user
-        
-        # Finally try standard username authentication
-        try:
-            user = User.objects.get(username=username)
+        for user in self._find_users(username):
             if user.check_password(password) and self.user_can_authenticate(user):
                 return user
-        except User.DoesNotExist:
-            pass
         
         return None
     
+    def _find_users(self, username):
+        """
+        Accounts the login identifier may refer to, best match first
+        
+        Args:
+            username: Username, email, or phone number as typed
+            
+        Returns:
+            list: Candidate User objects
+        """
+        # Phone numbers resolve through the student profile, with the user
+        # joined in the same query. Every accepted spelling (+254..., 254...,
+        # 07..., 7...) is normalized to the stored +254 form first, so it is
+        # a single index probe whichever one was typed.
+        phone_number = PhoneNumberAuthBackend()._normalize_phone_number(username)
+        if phone_number:
+            student = Student.objects.select_related('user').filter(
+                phone_number=phone_number
+            ).first()
+            if student:
+                return [student.user]
+        
+        # Username and email in one query; an exact username match wins.
+        # Email is compared on LOWER(email) so user_email_lower_idx serves it
+        # alongside the username index, and addresses match regardless of
+        # case as they do at registration.
+        users = User.objects.annotate(email_lower=Lower('email')).filter(
+            Q(username=username) | Q(email_lower=username.lower())
+        )
+        return sorted(users, key=lambda user: user.username != username)
+    
     def user_can_authenticate(self, user):
         """
         Check if user account is active
@@ -0,0 +1,150 @@
+"""
+factory_boy factories for scholarships test fixtures.
+
+Defaults describe a typical undergraduate in Nairobi; tests override only
+the fields they care about.
+"""
+
+from datetime import date, timedelta
+from decimal import Decimal
+
+import factory
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.utils import timezone
+
+from .models import County, Provider, Student, Scholarship
+
+# Rows per INSERT statement in create_batch_bulk, keeping large batches under
+# parameter limits (a class attribute would be taken for a model field)
+BULK_BATCH_SIZE = 500
+
+
+class UserFactory(factory.django.DjangoModelFactory):
+    """User accounts that never log in, so no password hashing is done"""
+
+    class Meta:
+        model = User
+        django_get_or_create = ('username',)
+
+    username = factory.Sequence(lambda n: f'user{n}')
+    email = factory.LazyAttribute(lambda user: f'{user.username}@example.com')
+    password = factory.django.Password(None)
+
+
+class CountyFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = County
+        django_get_or_create = ('code',)
+
+    name = 'nairobi'
+    code = '047'
+    capital_city = 'Nairobi'
+
+
+class ProviderFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Provider
+        django_get_or_create = ('slug',)
+
+    name = 'Test Foundation'
+    slug = 'test-foundation'
+    provider_type = 'foundation'
+    funding_source = 'private'
+    email = 'info@testfoundation.org'
+    phone_number = '+254712345678'
+    physical_address = 'Test Address, Nairobi'
+
+
+class StudentFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Student
+        django_get_or_create = ('national_id',)
+
+    user = factory.SubFactory(UserFactory)
+    first_name = factory.Sequence(lambda n: f'Student{n}')
+    last_name = 'Doe'
+    date_of_birth = date(2000, 1, 1)
+    gender = 'M'
+    national_id = factory.Sequence(lambda n: f'{30000000 + n}')
+    phone_number = factory.Sequence(lambda n: f'+2547{30000000 + n}')
+    email = factory.LazyAttribute(lambda student: student.user.email)
+    county = factory.SubFactory(CountyFactory)
+    sub_county = 'Westlands'
+    ward = 'Parklands'
+    current_education_level = 'undergraduate'
+    current_institution = 'University of Nairobi'
+    course_of_study = 'Computer Science'
+    year_of_study = 3
+    expected_graduation_year = 2025
+    family_income_annual = Decimal('500000')
+    number_of_dependents = 3
+    disability_status = 'none'
+    is_orphan = False
+    is_single_parent_child = False
+    is_child_headed_household = False
+
+    @classmethod
+    def create_batch_bulk(cls, *overrides):
+        """
+        Insert one student per overrides dict with a bulk_create per table.
+
+        Args:
+            *overrides: Field values for each student; 'user__<field>' keys
+                are passed on to the user's factory
+
+        Returns:
+            list: The saved Student objects
+        """
+        students = []
+        default_county = None
+        for kwargs in overrides:
+            # build() would leave a default county unsaved, so save it first
+            if 'county' not in kwargs:
+                if default_county is None:
+                    default_county = CountyFactory()
+                kwargs = dict(kwargs, county=default_county)
+            students.append(cls.build(**kwargs))
+        with transaction.atomic():
+            users = User.objects.bulk_create(
+                [student.user for student in students], batch_size=BULK_BATCH_SIZE
+            )
+            for student, user in zip(students, users):
+                student.user = user
+                # bulk_create skips save(), which normally fills this in
+                student.profile_completion = student.calculate_profile_completion()
+            return Student.objects.bulk_create(students, batch_size=BULK_BATCH_SIZE)
+
+    @classmethod
+    def create_many(cls, size, **kwargs):
+        """
+        Bulk-insert `size` students sharing the same field values.
+
+        Args:
+            size: Number of students to create
+            **kwargs: Field values applied to every student
+
+        Returns:
+            list: The saved Student objects
+        """
+        return cls.create_batch_bulk(*[kwargs] * size)
+
+
+class ScholarshipFactory(factory.django.DjangoModelFactory):
+    class Meta:
+        model = Scholarship
+
+    title = factory.Sequence(lambda n: f'Test Scholarship {n}')
+    slug = factory.Sequence(lambda n: f'test-scholarship-{n}')
+    provider = factory.SubFactory(ProviderFactory)
+    scholarship_type = 'academic'
+    amount_per_beneficiary = Decimal('100000')
+    number_of_awards = 10
+    total_budget = factory.LazyAttribute(
+        lambda scholarship: scholarship.amount_per_beneficiary * scholarship.number_of_awards
+    )
+    description = factory.LazyAttribute(lambda scholarship: f'{scholarship.title} description')
+    application_start_date = factory.LazyFunction(timezone.now)
+    application_deadline = factory.LazyAttribute(
+        lambda scholarship: scholarship.application_start_date + timedelta(days=30)
+    )
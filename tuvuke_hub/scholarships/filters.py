@@ -1,6 +1,7 @@
 import django_filters
 from django.db.models import Q
 from .models import Scholarship, Application, County
+from .queries import education_level_q
 
 
 class ScholarshipFilter(django_filters.FilterSet):
@@ -94,19 +95,9 @@ class ScholarshipFilter(django_filters.FilterSet):
         fields = []  # We define filters explicitly above
     
     def filter_education_level(self, queryset, name, value):
-        """Filter scholarships by education level - SQLite compatible"""
+        """Filter scholarships by education level in SQL"""
         if value:
-            # Get all scholarships first, then filter in Python
-            all_scholarships = list(queryset)
-            filtered_ids = []
-            for scholarship in all_scholarships:
-                target_levels = scholarship.target_education_levels or []
-                if (not target_levels or 
-                    'all_levels' in target_levels or 
-                    value in target_levels):
-                    filtered_ids.append(scholarship.id)
-            
-            return Scholarship.objects.filter(id__in=filtered_ids)
+            return queryset.filter(education_level_q(value))
         return queryset
     
     def filter_gender(self, queryset, name, value):
@@ -126,31 +117,14 @@ class ScholarshipFilter(django_filters.FilterSet):
     def filter_search(self, queryset, name, value):
         """Search in multiple fields - SQLite compatible"""
         if value:
-            # For basic text fields, use standard icontains
-            text_filtered = queryset.filter(
+            # Tags are a JSON list, matched as text like the other fields so
+            # the whole search is one WHERE clause the trigram indexes serve
+            return queryset.filter(
                 Q(title__icontains=value) |
                 Q(description__icontains=value) |
-                Q(provider__name__icontains=value)
+                Q(provider__name__icontains=value) |
+                Q(tags__icontains=value)
             )
-            
-            # For tags (JSON field), filter in Python
-            all_scholarships = list(text_filtered)
-            tag_matched_ids = []
-            for scholarship in all_scholarships:
-                tags = scholarship.tags or []
-                if any(value.lower() in tag.lower() for tag in tags):
-                    tag_matched_ids.append(scholarship.id)
-            
-            # Combine results
-            if tag_matched_ids:
-                return queryset.filter(
-                    Q(title__icontains=value) |
-                    Q(description__icontains=value) |
-                    Q(provider__name__icontains=value) |
-                    Q(id__in=tag_matched_ids)
-                )
-            else:
-                return text_filtered
         return queryset
     
     @property
@@ -2,6 +2,9 @@ from django import forms
 from django.contrib.auth.models import User
 from django.contrib.auth.forms import UserCreationForm
 from django.core.exceptions import ValidationError
+from django.db.models import QuerySet
+from django.db.models.functions import Lower
+from django.forms.models import ModelChoiceIterator
 from django.utils import timezone
 from datetime import date
 import re
@@ -9,6 +12,65 @@ import re
 from .models import Student, County
 
 
+class CountyChoiceIterator(ModelChoiceIterator):
+    """Yield choices from the field's preloaded counties when it has them"""
+    
+    def __iter__(self):
+        if self.field.counties is None:
+            yield from super().__iter__()
+            return
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        for county in self.field.counties:
+            yield self.choice(county)
+    
+    def __len__(self):
+        if self.field.counties is None:
+            return super().__len__()
+        return len(self.field.counties) + (1 if self.field.empty_label is not None else 0)
+
+
+class CountyChoiceField(forms.ModelChoiceField):
+    """
+    ModelChoiceField that can work from counties already in memory.
+    
+    Counties are fixed reference data, so a form given a loaded
+    `county_queryset` renders choices and resolves the submitted id
+    without a SELECT.
+    """
+    
+    iterator = CountyChoiceIterator
+    counties = None
+    
+    def to_python(self, value):
+        if self.counties is None or value in self.empty_values:
+            return super().to_python(value)
+        
+        key = self.to_field_name or 'pk'
+        if isinstance(value, County):
+            value = getattr(value, key)
+        for county in self.counties:
+            if str(getattr(county, key)) == str(value):
+                return county
+        raise ValidationError(
+            self.error_messages['invalid_choice'],
+            code='invalid_choice',
+            params={'value': value},
+        )
+    
+    def set_counties(self, county_queryset):
+        """
+        Render and validate the field from counties already loaded.
+        
+        Args:
+            county_queryset: County queryset or list; list() reuses the
+                result cache of an already evaluated queryset
+        """
+        if isinstance(county_queryset, QuerySet):
+            self.queryset = county_queryset
+        self.counties = list(county_queryset)
+
+
 class StudentRegistrationForm(UserCreationForm):
     """
     Extended user registration form that includes Student profile creation
@@ -96,7 +158,7 @@ class StudentRegistrationForm(UserCreationForm):
     )
 
     # Location Information
-    county = forms.ModelChoiceField(
+    county = CountyChoiceField(
         queryset=County.objects.all(),
         empty_label="Select your county",
         widget=forms.Select(attrs={
@@ -282,9 +344,13 @@ class StudentRegistrationForm(UserCreationForm):
             }),
         }
 
-    def __init__(self, *args, **kwargs):
+    def __init__(self, *args, county_queryset=None, **kwargs):
         super().__init__(*args, **kwargs)
         
+        # Render and validate the county from a preloaded queryset when given
+        if county_queryset is not None:
+            self.fields['county'].set_counties(county_queryset)
+        
         # Customize User fields
         self.fields['username'].help_text = "Choose a unique username for login"
         self.fields['password1'].widget.attrs['class'] = 'form-control'
@@ -332,9 +398,13 @@ class StudentRegistrationForm(UserCreationForm):
                 self.fields = ordered_fields
 
     def clean_email(self):
-        """Validate email uniqueness"""
+        """Validate email uniqueness, ignoring case"""
         email = self.cleaned_data.get('email')
-        if email and User.objects.filter(email=email).exists():
+        # Compare on LOWER(email) so the user_email_lower_idx index applies;
+        # email__iexact compiles to UPPER() or LIKE and would scan the table
+        if email and User.objects.annotate(
+            email_lower=Lower('email')
+        ).filter(email_lower=email.lower()).exists():
             raise ValidationError("A user with this email already exists.")
         return email
 
@@ -755,7 +825,7 @@ class StudentSearchForm(forms.Form):
             'placeholder': 'Search by name, email, or National ID...'
         })
     )
-    county = forms.ModelChoiceField(
+    county = CountyChoiceField(
         queryset=County.objects.all(),
         required=False,
         empty_label="All counties",
@@ -798,3 +868,10 @@ class StudentSearchForm(forms.Form):
             'placeholder': 'Max age'
         })
     )
+
+    def __init__(self, *args, county_queryset=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        
+        # Render and validate the county from a preloaded queryset when given
+        if county_queryset is not None:
+            self.fields['county'].set_counties(county_queryset)
@@ -11,6 +11,7 @@ from django.utils import timezone
 from datetime import date, timedelta
 import re
 
+from .forms import CountyChoiceField
 from .models import Student, County
 
 
@@ -155,7 +156,7 @@ class OnboardingStep2Form(forms.Form):
         help_text='Your email address for notifications'
     )
     
-    county = forms.ModelChoiceField(
+    county = CountyChoiceField(
         queryset=County.objects.all().order_by('name'),
         empty_label='Select your county',
         widget=forms.Select(attrs={
@@ -192,6 +193,13 @@ class OnboardingStep2Form(forms.Form):
         help_text='Your specific location/village (optional)'
     )
     
+    def __init__(self, *args, county_queryset=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        
+        # Render and validate the county from preloaded counties when given
+        if county_queryset is not None:
+            self.fields['county'].set_counties(county_queryset)
+    
     def clean_phone_number(self):
         """Normalize and validate phone number"""
         phone = self.cleaned_data.get('phone_number')
@@ -0,0 +1,73 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+from scholarships.views_onboarding import StudentOnboardingView, bulk_complete_registrations
+
+# Fields that must be unique, so two rows of one file may not share them
+UNIQUE_FIELDS = ('username', 'email', 'national_id', 'phone_number')
+
+
+class Command(BaseCommand):
+    help = 'Create student accounts in bulk from a JSON file of onboarding submissions'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'path',
+            type=str,
+            help='JSON file holding a list of registrations, each shaped like the '
+                 'onboarding submit body: {"1": {...}, "2": {...}, ..., "5": {...}}'
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate the file without creating any accounts'
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with open(options['path'], encoding='utf-8') as registrations_file:
+                rows = json.load(registrations_file)
+        except (OSError, ValueError) as e:
+            raise CommandError(f'Could not read {options["path"]}: {e}')
+        if not isinstance(rows, list):
+            raise CommandError('The file must hold a JSON list of registrations')
+
+        # Every row goes through the same forms as the onboarding wizard
+        registrations = []
+        errors = []
+        seen = {field: {} for field in UNIQUE_FIELDS}
+        for number, row in enumerate(rows, start=1):
+            registration_data, row_errors = StudentOnboardingView.validate_steps(
+                row if isinstance(row, dict) else {}
+            )
+            if row_errors:
+                errors.append(f'Row {number}: {json.dumps(row_errors)}')
+                continue
+            for field in UNIQUE_FIELDS:
+                value = str(registration_data[field]).lower()
+                if value in seen[field]:
+                    errors.append(f'Row {number}: {field} repeats row {seen[field][value]}')
+                seen[field].setdefault(value, number)
+            registrations.append(registration_data)
+
+        # All or nothing, so a corrected file can simply be run again
+        if errors:
+            for error in errors:
+                self.stdout.write(self.style.ERROR(error))
+            raise CommandError(f'{len(errors)} problem(s) found; no accounts were created')
+
+        if options['dry_run']:
+            self.stdout.write(
+                self.style.SUCCESS(f'{len(registrations)} registration(s) are valid')
+            )
+            return
+
+        try:
+            students = bulk_complete_registrations(registrations)
+        except IntegrityError as e:
+            raise CommandError(f'No accounts were created: {e}')
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Created {len(students)} student account(s)')
+        )
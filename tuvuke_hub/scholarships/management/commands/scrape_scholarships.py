@@ -1,16 +1,85 @@
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from bs4 import BeautifulSoup, SoupStrainer
 from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
 from django.utils.text import slugify
 from scholarships.models import Scholarship, Provider
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 import re
 import logging
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Patterns are compiled once at import; they run over every scraped page.
+# Order matters: the first pattern that matches wins.
+DEADLINE_PATTERNS = [
+    re.compile(r'deadline[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{4})', re.IGNORECASE),
+    re.compile(r'closes?[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{4})', re.IGNORECASE),
+    re.compile(r'due[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{4})', re.IGNORECASE),
+    re.compile(r'(\d{1,2}[/-]\d{1,2}[/-]\d{4})'),
+]
+
+# Matched against lowercased text
+AMOUNT_PATTERNS = [
+    re.compile(r'ksh?\s*(\d{1,3}(?:,\d{3})*)'),
+    re.compile(r'(\d{1,3}(?:,\d{3})*)\s*(?:kenya[n]?\s*)?shillings?'),
+    re.compile(r'(\d{1,3}(?:,\d{3})*)\s*thousand'),
+    re.compile(r'(\d{1,3}(?:,\d{3})*)\s*million'),
+]
+
+# Numeric dates are read straight from a regex match, day first as in
+# Kenya and month first as a fallback, instead of trying formats in turn
+DAY_FIRST_DATE_RE = re.compile(r'(\d{1,2})([/-])(\d{1,2})\2(\d{4})')
+YEAR_FIRST_DATE_RE = re.compile(r'(\d{4})([/-])(\d{1,2})\2(\d{1,2})')
+TEXT_DATE_FORMATS = ('%d %B %Y', '%B %d, %Y')
+
+
+def parse_date(date_string):
+    """
+    Parse a date in one of the formats Kenyan sites use.
+    
+    Accepts dd/mm/yyyy (falling back to mm/dd/yyyy), yyyy/mm/dd, with '/'
+    or '-', and '31 December 2025' or 'December 31, 2025'.
+    
+    Args:
+        date_string: Text holding only the date
+        
+    Returns:
+        date: The parsed date, or None if it is not a valid date
+    """
+    date_string = date_string.strip()
+    
+    match = DAY_FIRST_DATE_RE.fullmatch(date_string)
+    if match:
+        first, _, second, year = match.groups()
+        for day, month in ((first, second), (second, first)):
+            try:
+                return date(int(year), int(month), int(day))
+            except ValueError:
+                continue
+        return None
+    
+    match = YEAR_FIRST_DATE_RE.fullmatch(date_string)
+    if match:
+        year, _, month, day = match.groups()
+        try:
+            return date(int(year), int(month), int(day))
+        except ValueError:
+            return None
+    
+    # Only text with letters can hold a month name
+    if not any(char.isalpha() for char in date_string):
+        return None
+    for fmt in TEXT_DATE_FORMATS:
+        try:
+            return datetime.strptime(date_string, fmt).date()
+        except ValueError:
+            continue
+    return None
+
 
 class Command(BaseCommand):
     help = 'Scrape Kenyan education websites for new scholarship opportunities'
@@ -100,6 +169,13 @@ class Command(BaseCommand):
         
         total_scraped = 0
         
+        # Every page of a website comes from the same host, so one session
+        # keeps the connection (and its TLS handshake) alive between pages
+        self.session = requests.Session()
+        self.session.mount('https://', HTTPAdapter(
+            max_retries=Retry(total=2, backoff_factor=0.3)
+        ))
+        
         for website in self.WEBSITES:
             if target_website and website['name'].lower() != target_website.lower():
                 continue
@@ -117,6 +193,8 @@ class Command(BaseCommand):
                 )
                 logger.error(f'Error scraping {website["name"]}: {str(e)}')
         
+        self.session.close()
+        
         self.stdout.write(
             self.style.SUCCESS(f'\nTotal scholarships scraped: {total_scraped}')
         )
@@ -132,10 +210,11 @@ class Command(BaseCommand):
             }
             
             # Get the main page
-            response = requests.get(website['url'], headers=headers, timeout=30)
+            response = self.session.get(website['url'], headers=headers, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # Only links are read from the listing page, so build no other tags
+            soup = BeautifulSoup(response.content, 'lxml', parse_only=SoupStrainer('a'))
             
             # Find scholarship-related links
             scholarship_links = soup.select(website['selectors']['scholarship_links'])
@@ -164,10 +243,10 @@ class Command(BaseCommand):
     def scrape_scholarship_page(self, url, website, headers):
         """Scrape individual scholarship page for details"""
         try:
-            response = requests.get(url, headers=headers, timeout=30)
+            response = self.session.get(url, headers=headers, timeout=30)
             response.raise_for_status()
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            soup = BeautifulSoup(response.content, 'lxml')
             
             # Extract title
             title_element = soup.select_one(website['selectors']['title'])
@@ -215,15 +294,8 @@ class Command(BaseCommand):
             
             # Look for deadline in the entire page text
             page_text = soup.get_text()
-            deadline_patterns = [
-                r'deadline[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{4})',
-                r'closes?[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{4})',
-                r'due[:\s]+(\d{1,2}[/-]\d{1,2}[/-]\d{4})',
-                r'(\d{1,2}[/-]\d{1,2}[/-]\d{4})'
-            ]
-            
-            for pattern in deadline_patterns:
-                match = re.search(pattern, page_text, re.IGNORECASE)
+            for pattern in DEADLINE_PATTERNS:
+                match = pattern.search(page_text)
                 if match:
                     deadline = self.parse_date_string(match.group(1))
                     if deadline:
@@ -238,38 +310,20 @@ class Command(BaseCommand):
     
     def parse_date_string(self, date_string):
         """Parse various date string formats"""
-        date_formats = [
-            '%d/%m/%Y', '%d-%m-%Y', '%m/%d/%Y', '%m-%d-%Y',
-            '%Y/%m/%d', '%Y-%m-%d', '%d %B %Y', '%B %d, %Y'
-        ]
-        
-        for fmt in date_formats:
-            try:
-                parsed_date = datetime.strptime(date_string.strip(), fmt)
-                # Convert to timezone-aware datetime
-                return timezone.make_aware(
-                    datetime.combine(parsed_date.date(), datetime.min.time())
-                )
-            except ValueError:
-                continue
-        
-        return None
+        parsed_date = parse_date(date_string)
+        if parsed_date is None:
+            return None
+        # Convert to timezone-aware datetime
+        return timezone.make_aware(datetime.combine(parsed_date, datetime.min.time()))
     
     def estimate_scholarship_amount(self, title, description):
         """Estimate scholarship amount based on title and description"""
         # Look for amount patterns in title and description
         text = (title + ' ' + description).lower()
         
-        # Pattern for Kenyan Shillings
-        amount_patterns = [
-            r'ksh?\s*(\d{1,3}(?:,\d{3})*)',
-            r'(\d{1,3}(?:,\d{3})*)\s*(?:kenya[n]?\s*)?shillings?',
-            r'(\d{1,3}(?:,\d{3})*)\s*thousand',
-            r'(\d{1,3}(?:,\d{3})*)\s*million'
-        ]
-        
-        for pattern in amount_patterns:
-            match = re.search(pattern, text)
+        # Patterns for Kenyan Shillings
+        for pattern in AMOUNT_PATTERNS:
+            match = pattern.search(text)
             if match:
                 amount_str = match.group(1).replace(',', '')
                 try:
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.x on 2025-09-02 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scholarships', '0003_add_source_fields'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='student',
+            index=models.Index(
+                condition=models.Q(('is_verified', True), ('phone_number__isnull', False)),
+                fields=['is_verified', 'current_education_level'],
+                name='student_verified_edu_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='application',
+            index=models.Index(
+                fields=['scholarship', 'student'],
+                name='application_schol_student_idx',
+            ),
+        ),
+    ]
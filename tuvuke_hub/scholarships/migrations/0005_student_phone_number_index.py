@@ -0,0 +1,26 @@
+# Generated by Django 4.2.x on 2025-09-02 10:00
+
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scholarships', '0004_add_deadline_reminder_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='student',
+            name='phone_number',
+            field=models.CharField(
+                db_index=True,
+                max_length=15,
+                validators=[django.core.validators.RegexValidator(
+                    message='Phone number must be in format +254XXXXXXXXX',
+                    regex='^\\+?254[0-9]{9}$',
+                )],
+            ),
+        ),
+    ]
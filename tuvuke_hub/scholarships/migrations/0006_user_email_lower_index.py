@@ -0,0 +1,52 @@
+# Generated by Django 4.2.x on 2025-09-02 10:00
+
+from django.db import migrations
+
+INDEX_NAME = 'user_email_lower_idx'
+
+
+def create_email_lower_index(apps, schema_editor):
+    """
+    Index LOWER(auth_user.email) for the case-insensitive duplicate checks
+    done at registration.
+    """
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        # CONCURRENTLY keeps auth_user writable while the index builds
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {INDEX_NAME} ON auth_user (LOWER(email))'
+        )
+    elif vendor == 'sqlite':
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON auth_user (LOWER(email))'
+        )
+    elif vendor == 'mysql':
+        # Functional key parts need their own parentheses (MySQL 8.0.13+)
+        schema_editor.execute(
+            f'CREATE INDEX {INDEX_NAME} ON auth_user ((LOWER(email)))'
+        )
+
+
+def drop_email_lower_index(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {INDEX_NAME}')
+    elif vendor == 'sqlite':
+        schema_editor.execute(f'DROP INDEX IF EXISTS {INDEX_NAME}')
+    elif vendor == 'mysql':
+        schema_editor.execute(f'DROP INDEX {INDEX_NAME} ON auth_user')
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('scholarships', '0005_student_phone_number_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_email_lower_index, drop_email_lower_index),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 4.2.x on 2025-09-02 10:00
+
+from django.db import migrations, models
+
+
+# Fields tallied by Student.calculate_profile_completion when this migration
+# was written; copied so the backfill does not change as the model does
+ESSENTIAL_FIELDS = (
+    'first_name', 'last_name', 'date_of_birth', 'gender', 'national_id',
+    'phone_number', 'county_id', 'sub_county', 'ward',
+    'current_education_level', 'current_institution', 'course_of_study',
+    'year_of_study', 'expected_graduation_year', 'family_income_annual',
+)
+OPTIONAL_FIELDS = (
+    'other_names', 'alternative_phone', 'location', 'postal_address', 'profile_photo',
+)
+SPECIAL_CIRCUMSTANCE_FIELDS = (
+    'disability_status', 'is_orphan', 'is_single_parent_child', 'is_child_headed_household',
+)
+TRACKED_FIELD_COUNT = 25
+
+
+def profile_completion(student):
+    """Completion percentage of a historical Student, as the model computed it"""
+    completed_fields = sum(1 for field in ESSENTIAL_FIELDS if getattr(student, field))
+    completed_fields += sum(1 for field in OPTIONAL_FIELDS if getattr(student, field))
+    
+    # Zero dependents still counts as answered
+    if student.number_of_dependents is not None:
+        completed_fields += 1
+    if student.previous_gpa or student.previous_percentage:
+        completed_fields += 1
+    
+    # Special circumstances (count as 3 fields)
+    if any(getattr(student, field) for field in SPECIAL_CIRCUMSTANCE_FIELDS):
+        completed_fields += 3
+    
+    return int((completed_fields / TRACKED_FIELD_COUNT) * 100)
+
+
+def backfill_profile_completion(apps, schema_editor):
+    """Store the completion percentage for students created before the column"""
+    Student = apps.get_model('scholarships', 'Student')
+    students = list(Student.objects.all())
+    for student in students:
+        student.profile_completion = profile_completion(student)
+    Student.objects.bulk_update(students, ['profile_completion'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scholarships', '0006_user_email_lower_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='student',
+            name='profile_completion',
+            field=models.PositiveSmallIntegerField(
+                default=0,
+                editable=False,
+                help_text='Profile completion percentage, recalculated on every save',
+            ),
+        ),
+        migrations.RunPython(backfill_profile_completion, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.x on 2025-09-02 10:00
+
+from django.db import migrations
+
+# (index name, table, column) for every column searched with __icontains.
+# On PostgreSQL icontains compiles to UPPER("column"::text) LIKE UPPER(...),
+# so the trigram indexes are built on that same expression.
+TRIGRAM_INDEXES = [
+    ('student_first_name_trgm', 'scholarships_student', 'first_name'),
+    ('student_last_name_trgm', 'scholarships_student', 'last_name'),
+    ('student_other_names_trgm', 'scholarships_student', 'other_names'),
+    ('student_national_id_trgm', 'scholarships_student', 'national_id'),
+    ('student_institution_trgm', 'scholarships_student', 'current_institution'),
+    ('student_course_trgm', 'scholarships_student', 'course_of_study'),
+    ('user_email_trgm', 'auth_user', 'email'),
+    ('scholarship_title_trgm', 'scholarships_scholarship', 'title'),
+    ('scholarship_desc_trgm', 'scholarships_scholarship', 'description'),
+    ('provider_name_trgm', 'scholarships_provider', 'name'),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """
+    Add pg_trgm GIN indexes so substring searches stop scanning whole tables.
+
+    Only PostgreSQL has trigram indexes; other databases are left unchanged.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRIGRAM_INDEXES:
+        # CONCURRENTLY keeps the tables writable while the indexes build
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} '
+            f'ON {table} USING gin (UPPER({column}::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('scholarships', '0007_student_profile_completion'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 4.2.x on 2025-09-02 10:00
+
+from django.db import migrations
+
+# JSON list columns searched with __icontains. On PostgreSQL the lookup
+# compiles to UPPER("column"::text) LIKE UPPER(...), like the text columns
+# indexed in 0008.
+TRIGRAM_INDEXES = [
+    ('scholarship_fields_trgm', 'scholarships_scholarship', 'target_fields_of_study'),
+    ('scholarship_levels_trgm', 'scholarships_scholarship', 'target_education_levels'),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    """
+    Add pg_trgm GIN indexes for the JSON list columns matched by substring.
+
+    Only PostgreSQL has trigram indexes; other databases are left unchanged.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, table, column in TRIGRAM_INDEXES:
+        # CONCURRENTLY keeps the table writable while the indexes build
+        schema_editor.execute(
+            f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} '
+            f'ON {table} USING gin (UPPER({column}::text) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {name}')
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('scholarships', '0008_search_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
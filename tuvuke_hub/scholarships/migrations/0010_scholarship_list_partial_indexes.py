@@ -0,0 +1,45 @@
+# Generated by Django 4.2.x on 2025-09-02 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scholarships', '0009_json_trigram_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='scholarship',
+            index=models.Index(
+                condition=models.Q(('status', 'active')),
+                fields=['-is_featured', 'application_deadline', '-created_at'],
+                name='schol_active_sort_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='scholarship',
+            index=models.Index(
+                condition=models.Q(('for_orphans_only', True)),
+                fields=['application_deadline'],
+                name='schol_orphans_deadline_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='scholarship',
+            index=models.Index(
+                condition=models.Q(('for_disabled_only', True)),
+                fields=['application_deadline'],
+                name='schol_disabled_deadline_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='scholarship',
+            index=models.Index(
+                condition=models.Q(('renewable', True)),
+                fields=['application_deadline'],
+                name='schol_renewable_deadline_idx',
+            ),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 4.2.x on 2025-09-02 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('scholarships', '0010_scholarship_list_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='scholarship',
+            index=models.Index(
+                fields=['scholarship_type', 'status', 'application_deadline'],
+                name='schol_type_status_deadline_idx',
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='scholarship',
+            index=models.Index(
+                fields=['provider', 'status'],
+                name='schol_provider_status_idx',
+            ),
+        ),
+    ]
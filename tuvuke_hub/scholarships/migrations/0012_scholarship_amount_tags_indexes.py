@@ -0,0 +1,50 @@
+# Generated by Django 4.2.x on 2025-09-02 10:00
+
+from django.db import migrations, models
+
+# Tags are searched with __icontains, like the JSON columns indexed in 0009
+TAGS_INDEX_NAME = 'scholarship_tags_trgm'
+
+
+def create_tags_trigram_index(apps, schema_editor):
+    """
+    Add a pg_trgm GIN index for substring searches on scholarship tags.
+
+    Only PostgreSQL has trigram indexes; other databases are left unchanged.
+    """
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    # CONCURRENTLY keeps the table writable while the index builds
+    schema_editor.execute(
+        f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {TAGS_INDEX_NAME} '
+        f'ON scholarships_scholarship USING gin (UPPER(tags::text) gin_trgm_ops)'
+    )
+
+
+def drop_tags_trigram_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute(f'DROP INDEX CONCURRENTLY IF EXISTS {TAGS_INDEX_NAME}')
+
+
+class Migration(migrations.Migration):
+
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction
+    atomic = False
+
+    dependencies = [
+        ('scholarships', '0011_scholarship_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='scholarship',
+            index=models.Index(
+                fields=['amount_per_beneficiary'],
+                name='schol_active_amount_idx',
+                condition=models.Q(('status', 'active')),
+            ),
+        ),
+        migrations.RunPython(create_tags_trigram_index, drop_tags_trigram_index),
+    ]
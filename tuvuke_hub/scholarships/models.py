@@ -1,8 +1,14 @@
 from django.db import models
+from django.db.models import (
+    Case, Exists, ExpressionWrapper, F, FloatField, OuterRef, Q, Value, When
+)
 from django.contrib.auth.models import User
+from django.core.cache import cache
 from django.core.validators import MinValueValidator, MaxValueValidator, RegexValidator
 from django.utils import timezone
 from decimal import Decimal
+from functools import reduce
+import operator
 import uuid
 
 
@@ -96,6 +102,24 @@ class County(models.Model):
     
     def __str__(self):
         return self.get_name_display()
+    
+    # Cache key for the full county list; cleared by signals on save/delete
+    CACHE_KEY = 'counties:v1'
+    CACHE_TIMEOUT = 60 * 60 * 24
+    
+    @classmethod
+    def get_cached_list(cls):
+        """
+        Get all counties ordered by name, served from the cache.
+        
+        Returns:
+            list: County objects
+        """
+        return cache.get_or_set(
+            cls.CACHE_KEY,
+            lambda: list(cls.objects.order_by('name')),
+            cls.CACHE_TIMEOUT
+        )
 
 
 class Student(models.Model):
@@ -158,6 +182,7 @@ class Student(models.Model):
     # Contact Information
     phone_number = models.CharField(
         max_length=15,
+        db_index=True,
         validators=[RegexValidator(
             regex=r'^\+?254[0-9]{9}$',
             message="Phone number must be in format +254XXXXXXXXX"
@@ -241,19 +266,77 @@ class Student(models.Model):
     )
     
     # Metadata
+    profile_completion = models.PositiveSmallIntegerField(
+        default=0,
+        editable=False,
+        help_text="Profile completion percentage, recalculated on every save"
+    )
     is_verified = models.BooleanField(default=False)
     verification_date = models.DateTimeField(null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    # Fields counted by calculate_profile_completion, one point each when set
+    PROFILE_ESSENTIAL_FIELDS = (
+        'first_name', 'last_name', 'date_of_birth', 'gender', 'national_id',
+        'phone_number', 'county_id', 'sub_county', 'ward',
+        'current_education_level', 'current_institution', 'course_of_study',
+        'year_of_study', 'expected_graduation_year', 'family_income_annual',
+    )
+    PROFILE_OPTIONAL_FIELDS = (
+        'other_names', 'alternative_phone', 'location', 'postal_address', 'profile_photo',
+    )
+    PROFILE_SPECIAL_CIRCUMSTANCE_FIELDS = (
+        'disability_status', 'is_orphan', 'is_single_parent_child', 'is_child_headed_household',
+    )
+    PROFILE_TRACKED_FIELD_COUNT = 25
+    
     class Meta:
         verbose_name = "Student"
         verbose_name_plural = "Students"
         ordering = ['-created_at']
+        indexes = [
+            # Deadline reminders only ever look at verified students with a phone
+            models.Index(
+                fields=['is_verified', 'current_education_level'],
+                name='student_verified_edu_idx',
+                condition=Q(is_verified=True) & Q(phone_number__isnull=False),
+            ),
+        ]
     
     def __str__(self):
         return f"{self.first_name} {self.last_name} ({self.national_id})"
     
+    def save(self, *args, **kwargs):
+        """Save the student, refreshing the stored profile completion"""
+        self.profile_completion = self.calculate_profile_completion()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            kwargs['update_fields'] = {*update_fields, 'profile_completion'}
+        super().save(*args, **kwargs)
+    
+    def calculate_profile_completion(self):
+        """
+        Calculate profile completion percentage based on filled fields.
+        
+        Returns:
+            int: Completion percentage (0-100)
+        """
+        completed_fields = sum(1 for field in self.PROFILE_ESSENTIAL_FIELDS if getattr(self, field))
+        completed_fields += sum(1 for field in self.PROFILE_OPTIONAL_FIELDS if getattr(self, field))
+        
+        # Zero dependents still counts as answered
+        if self.number_of_dependents is not None:
+            completed_fields += 1
+        if self.previous_gpa or self.previous_percentage:
+            completed_fields += 1
+        
+        # Special circumstances (count as 3 fields)
+        if any(getattr(self, field) for field in self.PROFILE_SPECIAL_CIRCUMSTANCE_FIELDS):
+            completed_fields += 3
+        
+        return int((completed_fields / self.PROFILE_TRACKED_FIELD_COUNT) * 100)
+    
     @property
     def full_name(self):
         """Return full name of the student"""
@@ -270,6 +353,36 @@ class Student(models.Model):
         return today.year - self.date_of_birth.year - (
             (today.month, today.day) < (self.date_of_birth.month, self.date_of_birth.day)
         )
+    
+    # Seconds a uniqueness lookup is remembered for the AJAX validators
+    TAKEN_CACHE_TIMEOUT = 60
+    
+    @staticmethod
+    def taken_cache_key(field, value):
+        """Cache key for whether a student already uses `value` in `field`"""
+        return f'student_taken:{field}:{value}'
+    
+    @classmethod
+    def is_value_taken(cls, field, value):
+        """
+        Check whether any student already has the given unique value.
+        
+        Results are cached briefly so a form re-validating the same input
+        does not repeat the query; signals clear the entries when a
+        student is saved or deleted.
+        
+        Args:
+            field: 'national_id' or 'phone_number'
+            value: Normalized value to look up
+            
+        Returns:
+            bool: True if a student already uses the value
+        """
+        return cache.get_or_set(
+            cls.taken_cache_key(field, value),
+            lambda: cls.objects.filter(**{field: value}).exists(),
+            cls.TAKEN_CACHE_TIMEOUT
+        )
 
 
 class Provider(models.Model):
@@ -382,6 +495,24 @@ class Provider(models.Model):
     
     def __str__(self):
         return self.name
+    
+    # Cache key for the active provider list; cleared by signals on save/delete
+    CACHE_KEY = 'providers:active:v1'
+    CACHE_TIMEOUT = 60 * 60
+    
+    @classmethod
+    def get_cached_active_list(cls):
+        """
+        Get active providers ordered by name, served from the cache.
+        
+        Returns:
+            list: Provider objects
+        """
+        return cache.get_or_set(
+            cls.CACHE_KEY,
+            lambda: list(cls.objects.filter(is_active=True).order_by('name')),
+            cls.CACHE_TIMEOUT
+        )
 
 
 class Scholarship(models.Model):
@@ -648,6 +779,46 @@ class Scholarship(models.Model):
             models.Index(fields=['status', 'application_deadline']),
             models.Index(fields=['scholarship_type']),
             models.Index(fields=['provider']),
+            # The default list ordering over active scholarships, so a page
+            # can be read straight off the index
+            models.Index(
+                fields=['-is_featured', 'application_deadline', '-created_at'],
+                name='schol_active_sort_idx',
+                condition=Q(status='active'),
+            ),
+            # Type and provider filters on the scholarship list, which
+            # always narrow to a status and live deadlines as well
+            models.Index(
+                fields=['scholarship_type', 'status', 'application_deadline'],
+                name='schol_type_status_deadline_idx',
+            ),
+            models.Index(
+                fields=['provider', 'status'],
+                name='schol_provider_status_idx',
+            ),
+            # Amount range filter of the scholarship API, which only lists
+            # active scholarships
+            models.Index(
+                fields=['amount_per_beneficiary'],
+                name='schol_active_amount_idx',
+                condition=Q(status='active'),
+            ),
+            # Rare flags filtered on by the scholarship list
+            models.Index(
+                fields=['application_deadline'],
+                name='schol_orphans_deadline_idx',
+                condition=Q(for_orphans_only=True),
+            ),
+            models.Index(
+                fields=['application_deadline'],
+                name='schol_disabled_deadline_idx',
+                condition=Q(for_disabled_only=True),
+            ),
+            models.Index(
+                fields=['application_deadline'],
+                name='schol_renewable_deadline_idx',
+                condition=Q(renewable=True),
+            ),
         ]
     
     def __str__(self):
@@ -680,12 +851,17 @@ class Scholarship(models.Model):
         self.application_count += 1
         self.save(update_fields=['application_count'])
 
-    def calculate_match_score(self, student):
+    def calculate_match_score(self, student, target_counties=None):
         """
         Calculate how well a student matches this scholarship's eligibility criteria.
         
+        Issues at most one query (for target_counties), and none when the
+        scholarship was loaded with prefetch_related('target_counties').
+        
         Args:
             student: Student object to evaluate
+            target_counties: Optional iterable of County objects used instead
+                of self.target_counties, e.g. for unsaved scholarships
             
         Returns:
             float: Match score as a percentage (0-100)
@@ -726,9 +902,14 @@ class Scholarship(models.Model):
                     matched_criteria += 10
         
         # County Match (weight: 10%)
-        if self.target_counties.exists():
+        # Compare ids against .all() so a prefetch_related('target_counties')
+        # cache is reused and student.county is never fetched.
+        if target_counties is None:
+            target_counties = self.target_counties.all()
+        target_county_ids = {county.id for county in target_counties}
+        if target_county_ids:
             total_criteria += 10
-            if student.county in self.target_counties.all():
+            if student.county_id in target_county_ids:
                 matched_criteria += 10
         
         # Family Income Match (weight: 15%)
@@ -794,6 +975,281 @@ class Scholarship(models.Model):
         match_score = (matched_criteria / total_criteria) * 100
         return round(match_score, 2)
 
+    def calculate_match_scores_bulk(self, students, target_counties=None):
+        """
+        Score many students at once with the same weights as calculate_match_score.
+        
+        Student columns are read with one values_list() query and every
+        criterion is evaluated as a NumPy array operation over all students.
+        
+        Args:
+            students: Student queryset to evaluate
+            target_counties: Optional iterable of County objects used instead
+                of self.target_counties, e.g. for unsaved scholarships
+            
+        Returns:
+            dict: Match score (0-100) keyed by student id
+        """
+        import numpy as np
+        
+        rows = list(students.values_list(
+            'id', 'current_education_level', 'previous_gpa', 'previous_percentage',
+            'date_of_birth', 'county_id', 'family_income_annual', 'gender',
+            'course_of_study', 'is_orphan', 'disability_status',
+            'is_single_parent_child', 'is_child_headed_household',
+        ))
+        if not rows:
+            return {}
+        
+        (ids, levels, gpas, percentages, birth_dates, county_ids, incomes, genders,
+         courses, is_orphan, disability, single_parent, child_headed) = zip(*rows)
+        
+        def column(values, dtype=float):
+            # Missing values become 0, which every criterion treats as "not provided"
+            return np.array([value or 0 for value in values], dtype=dtype)
+        
+        gpas = column(gpas)
+        percentages = column(percentages)
+        incomes = column(incomes)
+        total = np.zeros(len(rows))
+        matched = np.zeros(len(rows))
+        
+        # Education Level Match (weight: 20%)
+        if self.target_education_levels:
+            total += 20
+            matched += 20 * np.isin(np.array(levels, dtype=object), self.target_education_levels)
+        
+        # GPA/Percentage Match (weight: 15%)
+        uses_gpa = bool(self.minimum_gpa) & (gpas != 0)
+        if self.minimum_gpa:
+            total += 15 * uses_gpa
+            matched += 15 * (uses_gpa & (gpas >= float(self.minimum_gpa)))
+        if self.minimum_percentage:
+            uses_percentage = ~uses_gpa & (percentages != 0)
+            total += 15 * uses_percentage
+            matched += 15 * (uses_percentage & (percentages >= float(self.minimum_percentage)))
+        
+        # Age Match (weight: 10%)
+        if self.minimum_age or self.maximum_age:
+            total += 10
+            today = timezone.now().date()
+            ages = np.array([
+                today.year - born.year - ((today.month, today.day) < (born.month, born.day))
+                for born in birth_dates
+            ])
+            age_match = ages != 0
+            if self.minimum_age:
+                age_match &= ages >= self.minimum_age
+            if self.maximum_age:
+                age_match &= ages <= self.maximum_age
+            matched += 10 * age_match
+        
+        # County Match (weight: 10%)
+        if target_counties is None:
+            target_counties = self.target_counties.all()
+        target_county_ids = [county.id for county in target_counties]
+        if target_county_ids:
+            total += 10
+            matched += 10 * np.isin(column(county_ids, dtype=np.int64), target_county_ids)
+        
+        # Family Income Match (weight: 15%)
+        if self.maximum_family_income:
+            has_income = incomes != 0
+            total += 15 * has_income
+            matched += 15 * (has_income & (incomes <= float(self.maximum_family_income)))
+        
+        # Gender Match (weight: 5%)
+        if self.for_females_only or self.for_males_only:
+            total += 5
+            genders = np.array(genders, dtype=object)
+            matched += 5 * ((self.for_females_only & (genders == 'F')) |
+                            (self.for_males_only & (genders == 'M')))
+        
+        # Field of Study Match (weight: 10%)
+        if self.target_fields_of_study:
+            courses = np.char.lower(np.array([course or '' for course in courses], dtype=str))
+            field_match = np.zeros(len(rows), dtype=bool)
+            for field in self.target_fields_of_study:
+                field_match |= np.char.find(courses, field.lower()) >= 0
+            has_course = courses != ''
+            total += 10 * has_course
+            matched += 10 * (has_course & field_match)
+        
+        # Special Requirements (weight: 15%)
+        special_weight = 15
+        special_matched = np.zeros(len(rows))
+        special_total = 0
+        
+        if self.for_orphans_only:
+            special_total += 5
+            special_matched += 5 * np.array(is_orphan, dtype=bool)
+        
+        if self.for_disabled_only:
+            special_total += 5
+            special_matched += 5 * np.array([bool(status) and status != 'none' for status in disability])
+        
+        if self.eligibility_criteria:
+            special_total += 5
+            special_matched += 2.5 * ((gpas != 0) | (percentages != 0))
+            criteria = self.eligibility_criteria
+            if isinstance(criteria, dict):
+                if criteria.get('single_parent_child'):
+                    special_matched += 1.25 * np.array(single_parent, dtype=bool)
+                if criteria.get('child_headed_household'):
+                    special_matched += 1.25 * np.array(child_headed, dtype=bool)
+        
+        if special_total > 0:
+            total += special_weight
+            matched += (special_matched / special_total) * special_weight
+        
+        # No specific criteria means all students match
+        with np.errstate(divide='ignore', invalid='ignore'):
+            scores = np.where(total == 0, 100.0, (matched / total) * 100)
+        return {student_id: round(float(score), 2) for student_id, score in zip(ids, scores)}
+
+    @classmethod
+    def annotate_match_points(cls, queryset, student):
+        """
+        Annotate scholarships with the weights behind calculate_match_score.
+        
+        Every criterion except field of study is evaluated in SQL with the
+        student's attributes bound as constants, so scoring needs no
+        prefetches and no per-row queries. Field of study is a substring
+        test of the student's course against a JSON list, which has no
+        portable SQL form; match_score_from_points() adds it in Python.
+        
+        Args:
+            queryset: Scholarship queryset to annotate
+            student: Student object to evaluate
+            
+        Returns:
+            QuerySet: The queryset annotated with match_points and
+                match_weight, the matched and applicable criteria weights
+        """
+        def weight_if(condition, weight):
+            return Case(When(condition, then=Value(float(weight))), default=Value(0.0), output_field=FloatField())
+        
+        def total(terms):
+            return ExpressionWrapper(reduce(operator.add, terms, Value(0.0)), output_field=FloatField())
+        
+        weights = []
+        points = []
+        
+        # Education Level Match (weight: 20%); JSON text is matched on the
+        # quoted element since containment lookups are unavailable on SQLite
+        has_levels = Q(target_education_levels__isnull=False) & ~Q(target_education_levels=[])
+        weights.append(weight_if(has_levels, 20))
+        points.append(weight_if(
+            has_levels & Q(target_education_levels__icontains=f'"{student.current_education_level}"'), 20
+        ))
+        
+        # GPA/Percentage Match (weight: 15%)
+        uses_gpa = Q(minimum_gpa__gt=0)
+        if student.previous_gpa:
+            weights.append(weight_if(uses_gpa, 15))
+            points.append(weight_if(Q(minimum_gpa__gt=0, minimum_gpa__lte=student.previous_gpa), 15))
+        if student.previous_percentage:
+            uses_percentage = Q(minimum_percentage__gt=0)
+            if student.previous_gpa:
+                uses_percentage &= ~uses_gpa
+            weights.append(weight_if(uses_percentage, 15))
+            points.append(weight_if(
+                uses_percentage & Q(minimum_percentage__lte=student.previous_percentage), 15
+            ))
+        
+        # Age Match (weight: 10%)
+        has_age_limits = Q(minimum_age__gt=0) | Q(maximum_age__gt=0)
+        weights.append(weight_if(has_age_limits, 10))
+        student_age = student.age
+        if student_age:
+            points.append(weight_if(
+                has_age_limits
+                & ~Q(minimum_age__gt=student_age)
+                & ~Q(maximum_age__gt=0, maximum_age__lt=student_age),
+                10
+            ))
+        
+        # County Match (weight: 10%)
+        targeted = cls.target_counties.through.objects.filter(scholarship_id=OuterRef('pk'))
+        weights.append(weight_if(Exists(targeted), 10))
+        if student.county_id:
+            points.append(weight_if(Exists(targeted.filter(county_id=student.county_id)), 10))
+        
+        # Family Income Match (weight: 15%)
+        if student.family_income_annual:
+            weights.append(weight_if(Q(maximum_family_income__gt=0), 15))
+            points.append(weight_if(Q(maximum_family_income__gte=student.family_income_annual), 15))
+        
+        # Gender Match (weight: 5%)
+        weights.append(weight_if(Q(for_females_only=True) | Q(for_males_only=True), 5))
+        if student.gender == 'F':
+            points.append(weight_if(Q(for_females_only=True), 5))
+        elif student.gender == 'M':
+            points.append(weight_if(Q(for_males_only=True), 5))
+        
+        # Special Requirements (weight: 15%)
+        has_criteria = (
+            Q(eligibility_criteria__isnull=False)
+            & ~Q(eligibility_criteria={})
+            & ~Q(eligibility_criteria=[])
+        )
+        special_weights = [
+            weight_if(Q(for_orphans_only=True), 5),
+            weight_if(Q(for_disabled_only=True), 5),
+            weight_if(has_criteria, 5),
+        ]
+        special_points = []
+        if student.is_orphan:
+            special_points.append(weight_if(Q(for_orphans_only=True), 5))
+        if student.disability_status and student.disability_status != 'none':
+            special_points.append(weight_if(Q(for_disabled_only=True), 5))
+        if student.previous_gpa or student.previous_percentage:
+            special_points.append(weight_if(has_criteria, 2.5))
+        if student.is_single_parent_child:
+            special_points.append(weight_if(has_criteria & Q(eligibility_criteria__single_parent_child=True), 1.25))
+        if student.is_child_headed_household:
+            special_points.append(weight_if(has_criteria & Q(eligibility_criteria__child_headed_household=True), 1.25))
+        
+        special_weight = 15
+        queryset = queryset.alias(
+            special_total=total(special_weights),
+            special_matched=total(special_points),
+        )
+        weights.append(weight_if(Q(special_total__gt=0), special_weight))
+        points.append(Case(
+            When(special_total__gt=0, then=F('special_matched') * float(special_weight) / F('special_total')),
+            default=Value(0.0),
+            output_field=FloatField(),
+        ))
+        
+        return queryset.annotate(match_points=total(points), match_weight=total(weights))
+    
+    def match_score_from_points(self, student):
+        """
+        Finish a score for a scholarship loaded through annotate_match_points.
+        
+        Args:
+            student: The Student object passed to annotate_match_points
+            
+        Returns:
+            float: Match score as a percentage (0-100), equal to
+                calculate_match_score(student)
+        """
+        matched_criteria = self.match_points
+        total_criteria = self.match_weight
+        
+        # Field of Study Match (weight: 10%)
+        if self.target_fields_of_study and student.course_of_study:
+            total_criteria += 10
+            course = student.course_of_study.lower()
+            if any(field.lower() in course for field in self.target_fields_of_study):
+                matched_criteria += 10
+        
+        if total_criteria == 0:
+            return 100.0  # No specific criteria means all students match
+        
+        return round((matched_criteria / total_criteria) * 100, 2)
+
 
 class Application(models.Model):
     """Model representing scholarship applications"""
@@ -1009,6 +1465,7 @@ class Application(models.Model):
             models.Index(fields=['status', 'submission_date']),
             models.Index(fields=['scholarship', 'status']),
             models.Index(fields=['student']),
+            models.Index(fields=['scholarship', 'student'], name='application_schol_student_idx'),
         ]
     
     def __str__(self):
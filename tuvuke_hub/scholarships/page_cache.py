@@ -0,0 +1,50 @@
+"""
+Whole-response caching for public pages that look the same to every visitor.
+"""
+
+from functools import wraps
+
+from django.contrib.messages import get_messages
+from django.utils.cache import patch_cache_control
+from django.views.decorators.cache import cache_page
+
+
+def cache_page_for_anonymous(timeout):
+    """
+    Cache a view's response for anonymous visitors only.
+
+    Anonymous requests are answered from the cache without touching the view
+    or the database. Authenticated users see per-user content (match scores,
+    account menus), so their requests always go to the view. That way the
+    shared cache entry needs no Vary: Cookie split per session.
+
+    Flash messages are per visitor too: a request with pending messages
+    skips the cache, and a response that picked up new messages is marked
+    private so it is never stored.
+
+    Args:
+        timeout: Seconds a cached response stays valid
+
+    Returns:
+        callable: Decorator to apply to a view function
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def uncached_if_messages(request, *args, **kwargs):
+            response = view_func(request, *args, **kwargs)
+            # cache_page does not store responses marked private
+            if len(get_messages(request)):
+                patch_cache_control(response, private=True)
+            return response
+
+        cached_view = cache_page(timeout)(uncached_if_messages)
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            # len() counts pending messages without marking them as shown
+            if request.user.is_authenticated or len(get_messages(request)):
+                return uncached_if_messages(request, *args, **kwargs)
+            return cached_view(request, *args, **kwargs)
+
+        return wrapper
+    return decorator
@@ -0,0 +1,64 @@
+"""
+Reusable Q builders for scholarship eligibility filters.
+
+Shared by the HTML views, the HTMX endpoints and the REST API filters, so
+every entry point matches scholarships the same way.
+"""
+
+from django.db.models import Exists, OuterRef, Q
+from .models import Scholarship
+
+
+def county_q(county_id):
+    """
+    Match scholarships open to students from a county.
+    
+    Uses EXISTS subqueries on the target_counties join table, so rows are
+    not duplicated by the join and no DISTINCT is needed.
+    
+    Args:
+        county_id: County primary key
+        
+    Returns:
+        Q: Scholarships with no county restriction or targeting the county
+    """
+    targeted = Scholarship.target_counties.through.objects.filter(scholarship_id=OuterRef('pk'))
+    return Q(Exists(targeted.filter(county_id=county_id))) | ~Q(Exists(targeted))
+
+
+def education_level_q(education_level):
+    """
+    Match scholarships open to an education level.
+    
+    JSON containment lookups are unavailable on SQLite, so the quoted list
+    element is matched in the JSON text instead.
+    
+    Args:
+        education_level: Education level slug
+        
+    Returns:
+        Q: Scholarships with no level restriction, targeting all levels,
+            or listing the given level
+    """
+    return (
+        Q(target_education_levels=[]) |
+        Q(target_education_levels__icontains='"all_levels"') |
+        Q(target_education_levels__icontains=f'"{education_level}"')
+    )
+
+
+def field_of_study_q(field_of_study):
+    """
+    Match scholarships open to a field of study.
+    
+    Args:
+        field_of_study: Text to look for within the target fields
+        
+    Returns:
+        Q: Scholarships with no field restriction, or with a target field
+            containing the text (case-insensitive)
+    """
+    return (
+        Q(target_fields_of_study=[]) |
+        Q(target_fields_of_study__icontains=field_of_study)
+    )
@@ -0,0 +1,112 @@
+"""
+Personalized scholarship recommendations for the student dashboard.
+
+Rankings are cached per student and only store scholarship ids and scores,
+so what is rendered always comes from a fresh, cheap lookup by primary key.
+"""
+
+import heapq
+
+from django.core.cache import cache
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Scholarship
+
+# Scores below this are not worth recommending
+MIN_MATCH_SCORE = 40
+RECOMMENDATION_LIMIT = 8
+
+# Rankings stay valid until the student or any scholarship changes
+CACHE_TIMEOUT = 60 * 60
+VERSION_KEY = 'recommendations:version'
+
+
+def current_version():
+    """Version number that changes whenever a scholarship is edited"""
+    return cache.get_or_set(VERSION_KEY, 1, None)
+
+
+def _cache_key(student_id):
+    return f'recommendations:v{current_version()}:{student_id}'
+
+
+def invalidate_student(student_id):
+    """Drop the cached ranking of one student"""
+    cache.delete(_cache_key(student_id))
+
+
+def invalidate_all():
+    """Retire every cached ranking, e.g. after a scholarship changes"""
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 2, None)
+
+
+def active_scholarships():
+    """Scholarships currently accepting applications"""
+    # is_active is a property, so filter on the fields it checks
+    return Scholarship.objects.filter(
+        status='active',
+        application_deadline__gte=timezone.now()
+    )
+
+
+def rank_scholarships(student):
+    """
+    Score active scholarships for a student and keep the best matches.
+
+    Args:
+        student: Student object to evaluate
+
+    Returns:
+        list: Up to RECOMMENDATION_LIMIT (scholarship id, match score)
+            tuples, best match first
+    """
+    candidates = Scholarship.annotate_match_points(active_scholarships(), student).filter(
+        # Only field of study is scored outside SQL and it adds at most 10
+        # to both sides, so (points + 10) / (weight + 10) >= 40% bounds
+        # what a row can reach; rows below it are never fetched
+        match_points__gte=F('match_weight') * (MIN_MATCH_SCORE / 100) - 6
+    ).only(
+        'id', 'target_fields_of_study'
+    )
+
+    scored = []
+    for scholarship in candidates:
+        match_score = scholarship.match_score_from_points(student)
+        if match_score >= MIN_MATCH_SCORE:
+            scored.append((scholarship.id, match_score))
+
+    # Keep the top matches without sorting them all
+    return heapq.nlargest(RECOMMENDATION_LIMIT, scored, key=lambda item: item[1])
+
+
+def get_recommendations(student):
+    """
+    Get the student's recommended scholarships, ranking them on a cache miss.
+
+    Args:
+        student: Student object to evaluate
+
+    Returns:
+        list: Dicts with 'scholarship' and 'match_score', best match first
+    """
+    ranking = cache.get_or_set(
+        _cache_key(student.id),
+        lambda: rank_scholarships(student),
+        CACHE_TIMEOUT
+    )
+    if not ranking:
+        return []
+
+    # Reload by id so closed or edited scholarships never show stale details
+    scholarships = active_scholarships().select_related('provider').in_bulk(
+        [scholarship_id for scholarship_id, _ in ranking]
+    )
+    return [
+        {'scholarship': scholarships[scholarship_id], 'match_score': match_score}
+        for scholarship_id, match_score in ranking
+        if scholarship_id in scholarships
+    ]
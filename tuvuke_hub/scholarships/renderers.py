@@ -0,0 +1,31 @@
+"""
+REST framework renderers.
+"""
+
+import orjson
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.renderers import JSONRenderer
+
+# orjson covers dicts, lists, datetimes and UUIDs itself; anything else
+# (lazy translations, Decimals outside serializers, querysets) is handed to
+# the encoder REST framework would otherwise use
+_fallback_encoder = JSONEncoder()
+
+
+class OrjsonRenderer(JSONRenderer):
+    """
+    JSONRenderer backed by orjson.
+
+    Scholarship and application lists nest providers, counties and students,
+    so they are the largest payloads the site encodes. Output is compact
+    UTF-8, like JSONRenderer's default.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return orjson.dumps(
+            data,
+            default=_fallback_encoder.default,
+            option=orjson.OPT_NON_STR_KEYS
+        )
@@ -0,0 +1,21 @@
+"""
+Session serializers.
+"""
+
+import orjson
+
+
+class OrjsonSerializer:
+    """
+    Drop-in for django.core.signing.JSONSerializer backed by orjson.
+
+    Sessions are (de)serialized on every request that touches them, and the
+    onboarding wizard keeps a few dozen fields there across its steps.
+    Sessions written by the JSON serializer load unchanged.
+    """
+
+    def dumps(self, obj):
+        return orjson.dumps(obj)
+
+    def loads(self, data):
+        return orjson.loads(data)
@@ -1,8 +1,13 @@
-from django.db.models.signals import post_save, pre_save
+from django.contrib.auth.signals import user_logged_in
+from django.core.cache import cache
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
-from .models import Application, Scholarship
+from .access_control import ROLE_SESSION_KEY, get_role
+from .models import Application, County, Provider, Scholarship, Student
+from .recommendations import invalidate_all, invalidate_student
 from .sms import send_application_status_sms
+from .views_htmx import invalidate_scholarship_stats
 import logging
 
 logger = logging.getLogger(__name__)
@@ -226,3 +231,64 @@ def cleanup_old_status(sender, instance, **kwargs):
     """
     if hasattr(instance, '_old_status'):
         delattr(instance, '_old_status')
+
+
+@receiver(post_save, sender=County)
+@receiver(post_delete, sender=County)
+def invalidate_county_cache(sender, **kwargs):
+    """Drop the cached county list whenever a county changes"""
+    cache.delete(County.CACHE_KEY)
+
+
+@receiver(post_save, sender=Provider)
+@receiver(post_delete, sender=Provider)
+def invalidate_provider_cache(sender, **kwargs):
+    """Drop the cached active provider list whenever a provider changes"""
+    cache.delete(Provider.CACHE_KEY)
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+def invalidate_student_taken_cache(sender, instance, **kwargs):
+    """Forget cached uniqueness lookups for the student's identifiers"""
+    cache.delete_many([
+        Student.taken_cache_key('national_id', instance.national_id),
+        Student.taken_cache_key('phone_number', instance.phone_number),
+    ])
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_delete, sender=Student)
+def invalidate_student_recommendations(sender, instance, **kwargs):
+    """Re-rank a student's recommendations after their profile changes"""
+    invalidate_student(instance.id)
+
+
+@receiver(post_save, sender=Scholarship)
+@receiver(post_delete, sender=Scholarship)
+@receiver(m2m_changed, sender=Scholarship.target_counties.through)
+def invalidate_all_recommendations(sender, **kwargs):
+    """Re-rank every student's recommendations after a scholarship changes"""
+    # View and application counters are saved constantly and never affect ranking
+    update_fields = kwargs.get('update_fields')
+    if update_fields and set(update_fields) <= {'view_count', 'application_count'}:
+        return
+    invalidate_all()
+
+
+@receiver(post_save, sender=Scholarship)
+@receiver(post_delete, sender=Scholarship)
+@receiver(m2m_changed, sender=Scholarship.target_counties.through)
+def invalidate_search_stats(sender, **kwargs):
+    """Drop cached live-search statistics after a scholarship changes"""
+    update_fields = kwargs.get('update_fields')
+    if update_fields and set(update_fields) <= {'view_count', 'application_count'}:
+        return
+    invalidate_scholarship_stats()
+
+
+@receiver(user_logged_in)
+def store_user_role(sender, request, user, **kwargs):
+    """Resolve the user's role once per login so redirects need no query"""
+    if request is not None and hasattr(request, 'session'):
+        request.session[ROLE_SESSION_KEY] = get_role(user) or ''
@@ -1,5 +1,6 @@
 import africastalking
 import logging
+from string import Template
 from django.conf import settings
 from typing import Optional, Dict, Any
 
@@ -7,6 +8,28 @@ from typing import Optional, Dict, Any
 logger = logging.getLogger(__name__)
 
 
+# Status-specific SMS messages, compiled once at import time
+_STATUS_TEMPLATES = {
+    status: Template(text) for status, text in {
+        'submitted': "Dear $first_name, your application for $title has been submitted successfully. Application ID: $application_id",
+        
+        'under_review': "Dear $first_name, your application for $title is now under review. We will notify you of any updates.",
+        
+        'shortlisted': "Congratulations $first_name! You have been shortlisted for $title. Please check your email for next steps.",
+        
+        'interview_scheduled': "Dear $first_name, an interview has been scheduled for your $title application. Check your email for details.",
+        
+        'approved': "Congratulations $first_name! Your application for $title has been APPROVED! Award amount: KES $award_amount. Check your email for details.",
+        
+        'rejected': "Dear $first_name, we regret to inform you that your application for $title was not successful. Keep applying for other opportunities!",
+        
+        'waitlisted': "Dear $first_name, your application for $title has been waitlisted. You may be considered if slots become available.",
+        
+        'withdrawn': "Dear $first_name, your application for $title has been withdrawn as requested."
+    }.items()
+}
+
+
 class SMSService:
     """
     SMS Service using Africa's Talking API
@@ -202,6 +225,13 @@ def send_application_status_sms(application, old_status: Optional[str] = None) -
     Returns:
         dict: Response indicating success/failure
     """
+    if not sms_service.initialized:
+        return {
+            'success': False,
+            'error': 'SMS service not configured',
+            'recipients': []
+        }
+    
     if not application.student.phone_number:
         logger.warning(f"No phone number for student {application.student.full_name}")
         return {
@@ -210,27 +240,8 @@ def send_application_status_sms(application, old_status: Optional[str] = None) -
             'recipients': []
         }
     
-    # Create status-specific messages
-    status_messages = {
-        'submitted': f"Dear {application.student.first_name}, your application for {application.scholarship.title} has been submitted successfully. Application ID: {application.application_id}",
-        
-        'under_review': f"Dear {application.student.first_name}, your application for {application.scholarship.title} is now under review. We will notify you of any updates.",
-        
-        'shortlisted': f"Congratulations {application.student.first_name}! You have been shortlisted for {application.scholarship.title}. Please check your email for next steps.",
-        
-        'interview_scheduled': f"Dear {application.student.first_name}, an interview has been scheduled for your {application.scholarship.title} application. Check your email for details.",
-        
-        'approved': f"Congratulations {application.student.first_name}! Your application for {application.scholarship.title} has been APPROVED! Award amount: KES {application.award_amount:,.0f}. Check your email for details.",
-        
-        'rejected': f"Dear {application.student.first_name}, we regret to inform you that your application for {application.scholarship.title} was not successful. Keep applying for other opportunities!",
-        
-        'waitlisted': f"Dear {application.student.first_name}, your application for {application.scholarship.title} has been waitlisted. You may be considered if slots become available.",
-        
-        'withdrawn': f"Dear {application.student.first_name}, your application for {application.scholarship.title} has been withdrawn as requested."
-    }
-    
-    message = status_messages.get(application.status)
-    if not message:
+    template = _STATUS_TEMPLATES.get(application.status)
+    if not template:
         logger.warning(f"No SMS template for status: {application.status}")
         return {
             'success': False,
@@ -238,6 +249,13 @@ def send_application_status_sms(application, old_status: Optional[str] = None) -
             'recipients': []
         }
     
+    message = template.substitute(
+        first_name=application.student.first_name,
+        title=application.scholarship.title,
+        application_id=application.application_id,
+        award_amount=f"{application.award_amount or 0:,.0f}",
+    )
+    
     # Add Tuvuke Hub signature
     message += " - Tuvuke Hub"
     
@@ -263,6 +281,13 @@ def send_scholarship_deadline_reminder(scholarship, days_remaining: int) -> Dict
     Returns:
         dict: Response indicating success/failure
     """
+    if not sms_service.initialized:
+        return {
+            'success': False,
+            'error': 'SMS service not configured',
+            'recipients': []
+        }
+    
     from .models import Student, Application
     
     # Get students who might be interested but haven't applied
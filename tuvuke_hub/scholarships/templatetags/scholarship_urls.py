@@ -0,0 +1,11 @@
+from django import template
+
+from scholarships.url_cache import cached_reverse
+
+register = template.Library()
+
+
+@register.simple_tag
+def cached_url(name, *args):
+    """Like {% url %} for scholarships URLs, but memoized per name and arguments"""
+    return cached_reverse(name, *args)
@@ -0,0 +1,119 @@
+import json
+import os
+import tempfile
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.test import TestCase
+from django.utils import timezone
+from scholarships.models import County, Student
+from scholarships.views_onboarding import StudentOnboardingView, bulk_complete_registrations
+
+
+def onboarding_steps(n, county):
+    """Step data for one valid onboarding, shaped like the submit endpoint body"""
+    return {
+        '1': {
+            'first_name': f'Student{n}',
+            'last_name': 'Doe',
+            'date_of_birth': date(date.today().year - 20, 1, 15).isoformat(),
+            'gender': 'F',
+            'national_id': f'{40000000 + n}',
+        },
+        '2': {
+            'phone_number': f'07{20000000 + n}',
+            'email': f'student{n}@example.com',
+            'county': county.id,
+            'sub_county': 'Westlands',
+            'ward': 'Parklands',
+        },
+        '3': {
+            'current_education_level': 'undergraduate',
+            'current_institution': 'University of Nairobi',
+            'course_of_study': 'Computer Science',
+            'year_of_study': 1,
+            'expected_graduation_year': timezone.now().year + 3,
+        },
+        '4': {
+            'family_income_annual': '250000',
+            'number_of_dependents': 4,
+            'disability_status': 'none',
+        },
+        '5': {
+            'username': f'student{n}',
+            'password1': 'classpass123',
+            'password2': 'classpass123',
+            'terms_accepted': True,
+        },
+    }
+
+
+class BulkCompleteRegistrationsTest(TestCase):
+    """Accounts created in bulk must match the ones the onboarding wizard saves"""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.county = County.objects.create(name='nairobi', code='047', capital_city='Nairobi')
+
+    def setUp(self):
+        # The onboarding forms validate counties from the cached list
+        cache.clear()
+
+    def registration(self, n):
+        registration_data, errors = StudentOnboardingView.validate_steps(
+            onboarding_steps(n, self.county)
+        )
+        self.assertEqual(errors, {})
+        return registration_data
+
+    def test_creates_linked_users_and_students(self):
+        registrations = [self.registration(n) for n in range(3)]
+
+        with self.assertNumQueries(4):
+            students = bulk_complete_registrations(registrations)
+
+        self.assertEqual(len(students), 3)
+        for n, student in enumerate(Student.objects.select_related('user').order_by('national_id')):
+            self.assertEqual(student.user.username, f'student{n}')
+            self.assertEqual(student.user.email, student.email)
+            self.assertTrue(student.user.check_password('classpass123'))
+            self.assertEqual(student.county_id, self.county.id)
+            self.assertEqual(student.phone_number, f'+2547{20000000 + n}')
+            # bulk_create skips save(), so the stored value is checked directly
+            self.assertGreater(student.profile_completion, 0)
+            self.assertEqual(student.profile_completion, student.calculate_profile_completion())
+
+    def test_command_imports_file(self):
+        path = self.write_file([onboarding_steps(n, self.county) for n in range(2)])
+
+        call_command('import_registrations', path, stdout=open(os.devnull, 'w'))
+
+        self.assertEqual(User.objects.filter(student_profile__isnull=False).count(), 2)
+
+    def test_command_dry_run_creates_nothing(self):
+        path = self.write_file([onboarding_steps(0, self.county)])
+
+        call_command('import_registrations', path, '--dry-run', stdout=open(os.devnull, 'w'))
+
+        self.assertFalse(Student.objects.exists())
+
+    def test_command_rejects_whole_file_on_any_error(self):
+        invalid = onboarding_steps(1, self.county)
+        invalid['1']['national_id'] = '123'
+        repeated = onboarding_steps(2, self.county)
+        repeated['5']['username'] = 'student0'
+        path = self.write_file([onboarding_steps(0, self.county), invalid, repeated])
+
+        with self.assertRaises(CommandError):
+            call_command('import_registrations', path, stdout=open(os.devnull, 'w'))
+
+        self.assertFalse(User.objects.exists())
+
+    def write_file(self, rows):
+        registrations_file = tempfile.NamedTemporaryFile('w', suffix='.json', delete=False)
+        with registrations_file:
+            json.dump(rows, registrations_file)
+        self.addCleanup(os.remove, registrations_file.name)
+        return registrations_file.name
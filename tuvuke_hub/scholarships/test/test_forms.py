@@ -1,24 +1,38 @@
-from django.test import TestCase
+from django.test import TestCase, override_settings
+from django_perf_rec import TestCaseMixin
 from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from scholarships.forms import StudentRegistrationForm, StudentProfileUpdateForm, QuickRegistrationForm
 from scholarships.models import Student, County
+from scholarships.factories import StudentFactory
 
 
-class StudentRegistrationFormTest(TestCase):
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class StudentRegistrationFormTest(TestCaseMixin, TestCase):
     """Test cases for StudentRegistrationForm"""
     
-    def setUp(self):
-        """Set up test data"""
-        # Use get_or_create to avoid conflicts with migration data
-        self.county, created = County.objects.get_or_create(
+    # (field changes, expected error key)
+    INVALID_FIELD_CASES = [
+        ({'national_id': '123456'}, 'national_id'),  # Too short
+        ({'national_id': '12345abc'}, 'national_id'),  # Non-numeric
+        ({'phone_number': '123456'}, 'phone_number'),  # Completely invalid format
+        # GPA or percentage is required for higher education levels
+        ({'current_education_level': 'postgraduate', 'previous_gpa': None, 'previous_percentage': None}, '__all__'),
+    ]
+    
+    @classmethod
+    def setUpTestData(cls):
+        """Set up data shared by every test in the class"""
+        cls.county = County.objects.create(
+            name='nairobi',
             code='047',
-            defaults={
-                'name': 'Nairobi',
-                'capital_city': 'Nairobi'
-            }
+            capital_city='Nairobi'
         )
-        
+        # Loaded once so validation tests skip the county SELECT
+        cls.county_queryset = [cls.county]
+    
+    def setUp(self):
+        """Set up per-test form data"""
         self.valid_form_data = {
             'username': 'testuser',
             'email': 'test@example.com',
@@ -45,37 +59,41 @@ class StudentRegistrationFormTest(TestCase):
 
     def test_valid_form(self):
         """Test form with valid data"""
-        form = StudentRegistrationForm(data=self.valid_form_data)
-        self.assertTrue(form.is_valid(), f"Form errors: {form.errors}")
+        form = StudentRegistrationForm(data=self.valid_form_data, county_queryset=self.county_queryset)
+        with self.record_performance():
+            is_valid = form.is_valid()
+        self.assertTrue(is_valid, f"Form errors: {form.errors}")
 
-    def test_invalid_national_id(self):
-        """Test form with invalid National ID"""
-        # Test short National ID
-        data = self.valid_form_data.copy()
-        data['national_id'] = '123456'
-        form = StudentRegistrationForm(data=data)
-        self.assertFalse(form.is_valid())
-        self.assertIn('national_id', form.errors)
+    def test_field_validation(self):
+        """Test that invalid field values are rejected with the expected error"""
+        for changes, error_key in self.INVALID_FIELD_CASES:
+            with self.subTest(**changes):
+                data = self.valid_form_data.copy()
+                data.update(changes)
+                form = StudentRegistrationForm(data=data, county_queryset=self.county_queryset)
+                self.assertFalse(form.is_valid())
+                self.assertIn(error_key, form.errors)
+
+    def test_county_validation_with_preloaded_counties(self):
+        """Test that preloaded counties are rendered and validated without a query"""
+        county_queryset = County.objects.filter(pk=self.county.pk)
+        list(county_queryset)  # Evaluate up front, as a cached queryset would be
+        form = StudentRegistrationForm(county_queryset=county_queryset)
+        field = form.fields['county']
         
-        # Test non-numeric National ID
-        data['national_id'] = '12345abc'
-        form = StudentRegistrationForm(data=data)
-        self.assertFalse(form.is_valid())
-        self.assertIn('national_id', form.errors)
+        with self.assertNumQueries(0):
+            self.assertEqual(len(list(field.choices)), 2)  # Empty label + county
+            self.assertEqual(field.clean(str(self.county.id)), self.county)
+            with self.assertRaises(ValidationError):
+                field.clean(str(self.county.id + 1))
 
-    def test_invalid_phone_number(self):
-        """Test form with invalid phone number"""
+    def test_phone_number_normalization(self):
+        """Test that local phone numbers are converted to +254 format"""
         data = self.valid_form_data.copy()
-        data['phone_number'] = '0712345678'  # Should be converted to +254 format
+        data['phone_number'] = '0712345678'
         form = StudentRegistrationForm(data=data)
         if form.is_valid():
             self.assertEqual(form.cleaned_data['phone_number'], '+254712345678')
-        
-        # Test completely invalid format
-        data['phone_number'] = '123456'
-        form = StudentRegistrationForm(data=data)
-        self.assertFalse(form.is_valid())
-        self.assertIn('phone_number', form.errors)
 
     def test_age_validation(self):
         """Test age validation"""
@@ -94,12 +112,10 @@ class StudentRegistrationFormTest(TestCase):
 
     def test_duplicate_email(self):
         """Test duplicate email validation"""
-        # Create a user with the email first
-        User.objects.create_user(
-            username='existing_user',
-            email='test@example.com',
-            password='password123'
-        )
+        # Create a user with the email first (never logs in, so no password)
+        user = User(username='existing_user', email='test@example.com')
+        user.set_unusable_password()
+        user.save()
         
         form = StudentRegistrationForm(data=self.valid_form_data)
         self.assertFalse(form.is_valid())
@@ -108,30 +124,11 @@ class StudentRegistrationFormTest(TestCase):
     def test_duplicate_national_id(self):
         """Test duplicate National ID validation"""
         # Create a student with the National ID first
-        user = User.objects.create_user(
-            username='existing_user',
-            email='existing@example.com',
-            password='password123'
-        )
-        Student.objects.create(
-            user=user,
-            first_name='Jane',
-            last_name='Doe',
-            date_of_birth='1995-01-01',
-            gender='F',
-            national_id='12345678',  # Same as in form data
-            phone_number='+254700000000',
-            email='existing@example.com',
-            county=self.county,
-            sub_county='Test',
-            ward='Test',
-            current_education_level='undergraduate',
-            current_institution='Test University',
-            course_of_study='Test Course',
-            year_of_study=1,
-            expected_graduation_year=2025,
-            family_income_annual=100000
-        )
+        StudentFactory.create_batch_bulk({
+            'national_id': '12345678',  # Same as in form data
+            'phone_number': '+254700000000',
+            'county': self.county
+        })
         
         form = StudentRegistrationForm(data=self.valid_form_data)
         self.assertFalse(form.is_valid())
@@ -140,30 +137,11 @@ class StudentRegistrationFormTest(TestCase):
     def test_duplicate_phone_number(self):
         """Test duplicate phone number validation"""
         # Create a student with the phone number first
-        user = User.objects.create_user(
-            username='existing_user',
-            email='existing@example.com',
-            password='password123'
-        )
-        Student.objects.create(
-            user=user,
-            first_name='Jane',
-            last_name='Doe',
-            date_of_birth='1995-01-01',
-            gender='F',
-            national_id='87654321',
-            phone_number='+254712345678',  # Same as in form data
-            email='existing@example.com',
-            county=self.county,
-            sub_county='Test',
-            ward='Test',
-            current_education_level='undergraduate',
-            current_institution='Test University',
-            course_of_study='Test Course',
-            year_of_study=1,
-            expected_graduation_year=2025,
-            family_income_annual=100000
-        )
+        StudentFactory.create_batch_bulk({
+            'national_id': '87654321',
+            'phone_number': '+254712345678',  # Same as in form data
+            'county': self.county
+        })
         
         form = StudentRegistrationForm(data=self.valid_form_data)
         self.assertFalse(form.is_valid())
@@ -185,30 +163,20 @@ class StudentRegistrationFormTest(TestCase):
         self.assertEqual(student.national_id, '12345678')
         self.assertEqual(student.phone_number, '+254712345678')
 
-    def test_cross_field_validation(self):
-        """Test cross-field validation"""
-        data = self.valid_form_data.copy()
-        
-        # Test that GPA or percentage is required for higher education levels
-        data['current_education_level'] = 'postgraduate'
-        data['previous_gpa'] = None
-        data['previous_percentage'] = None
-        
-        form = StudentRegistrationForm(data=data)
-        self.assertFalse(form.is_valid())
-        self.assertIn('__all__', form.errors)
-
 
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
 class QuickRegistrationFormTest(TestCase):
     """Test cases for QuickRegistrationForm"""
     
-    def setUp(self):
-        self.county = County.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.county = County.objects.create(
             name='nairobi',
             code='047',
             capital_city='Nairobi'
         )
-        
+    
+    def setUp(self):
         self.valid_form_data = {
             'username': 'quickuser',
             'email': 'quick@example.com',
@@ -246,24 +214,24 @@ class QuickRegistrationFormTest(TestCase):
             self.assertEqual(form.cleaned_data['phone_number'], '+254700123456')
 
 
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
 class StudentProfileUpdateFormTest(TestCase):
     """Test cases for StudentProfileUpdateForm"""
     
-    def setUp(self):
-        self.county = County.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        cls.county = County.objects.create(
             name='nairobi',
             code='047',
             capital_city='Nairobi'
         )
         
-        self.user = User.objects.create_user(
-            username='testuser',
-            email='test@example.com',
-            password='password123'
-        )
+        cls.user = User(username='testuser', email='test@example.com')
+        cls.user.set_unusable_password()
+        cls.user.save()
         
-        self.student = Student.objects.create(
-            user=self.user,
+        cls.student = Student.objects.create(
+            user=cls.user,
             first_name='John',
             last_name='Doe',
             date_of_birth='1995-01-01',
@@ -271,7 +239,7 @@ class StudentProfileUpdateFormTest(TestCase):
             national_id='12345678',
             phone_number='+254712345678',
             email='test@example.com',
-            county=self.county,
+            county=cls.county,
             sub_county='Westlands',
             ward='Kitisuru',
             current_education_level='undergraduate',
@@ -313,30 +281,11 @@ class StudentProfileUpdateFormTest(TestCase):
     def test_phone_number_uniqueness_on_update(self):
         """Test phone number uniqueness when updating (should exclude current student)"""
         # Create another student with a different phone number
-        another_user = User.objects.create_user(
-            username='anotheruser',
-            email='another@example.com',
-            password='password123'
-        )
-        Student.objects.create(
-            user=another_user,
-            first_name='Jane',
-            last_name='Smith',
-            date_of_birth='1996-01-01',
-            gender='F',
-            national_id='87654321',
-            phone_number='+254700111222',
-            email='another@example.com',
-            county=self.county,
-            sub_county='Test',
-            ward='Test',
-            current_education_level='undergraduate',
-            current_institution='Test University',
-            course_of_study='Test Course',
-            year_of_study=1,
-            expected_graduation_year=2025,
-            family_income_annual=100000
-        )
+        StudentFactory.create_batch_bulk({
+            'national_id': '87654321',
+            'phone_number': '+254700111222',
+            'county': self.county
+        })
         
         # Try to update our student's phone to the other student's phone
         form_data = {
@@ -1,325 +1,381 @@
 """
 Tests for the calculate_match_score method on Scholarship model
 """
-from django.test import TestCase
-from django.contrib.auth.models import User
+from django.test import SimpleTestCase, TestCase
 from django.utils import timezone
+from django_perf_rec import TestCaseMixin
 from decimal import Decimal
 from datetime import date, timedelta
 
-from .models import County, Student, Provider, Scholarship
+from scholarships.factories import CountyFactory, ProviderFactory, ScholarshipFactory, StudentFactory
+from scholarships.models import County, Student, Scholarship
 
+# Decimal fixture values, parsed once at import
+GPA_3_0 = Decimal('3.0')
+GPA_3_5 = Decimal('3.5')
+GPA_3_8 = Decimal('3.8')
+PERCENT_75 = Decimal('75.0')
+PERCENT_80 = Decimal('80.0')
+PERCENT_82 = Decimal('82.0')
+PERCENT_85 = Decimal('85.0')
+INCOME_200K = Decimal('200000')
+INCOME_300K = Decimal('300000')
+INCOME_350K = Decimal('350000')
+INCOME_400K = Decimal('400000')
+INCOME_500K = Decimal('500000')
+INCOME_600K = Decimal('600000')
+AMOUNT_50K = Decimal('50000')
+AMOUNT_75K = Decimal('75000')
+AMOUNT_80K = Decimal('80000')
+AMOUNT_100K = Decimal('100000')
 
-class MatchScoreTestCase(TestCase):
+
+class MatchScoreTestCase(TestCaseMixin, TestCase):
     """Test cases for scholarship matching algorithm"""
 
-    def setUp(self):
-        """Set up test data"""
-        # Get or create test county (Nairobi already exists from migration)
-        self.county, created = County.objects.get_or_create(
-            code="047",
-            defaults={"name": "Nairobi"}
-        )
+    @classmethod
+    def setUpTestData(cls):
+        """Set up data shared by every test in the class"""
+        cls.now = timezone.now()
+        cls.deadline = cls.now + timedelta(days=30)
         
-        # Create test provider
-        self.provider = Provider.objects.create(
-            name="Test Foundation",
-            slug="test-foundation",
-            provider_type="foundation",
-            funding_source="private",
-            email="info@testfoundation.org",
-            phone_number="+254712345678",
-            physical_address="Test Address, Nairobi"
-        )
-        
-        # Create test user and student
-        self.user = User.objects.create_user(
-            username="teststudent",
-            email="student@test.com",
-            password="testpass123"
-        )
+        cls.county = CountyFactory()
+        cls.provider = ProviderFactory()
         
-        self.student = Student.objects.create(
-            user=self.user,
+        cls.student = StudentFactory(
             first_name="John",
-            last_name="Doe",
-            date_of_birth=date(2000, 1, 1),  # 24 years old
-            gender="M",
-            national_id="12345678",
-            phone_number="+254712345678",
-            email="student@test.com",
-            county=self.county,
-            sub_county="Westlands",
-            ward="Parklands",
-            current_education_level="undergraduate",
-            current_institution="University of Nairobi",
-            course_of_study="Computer Science",
-            year_of_study=3,
-            expected_graduation_year=2025,
-            previous_gpa=Decimal('3.5'),
-            previous_percentage=Decimal('75.0'),
-            family_income_annual=Decimal('500000'),
-            number_of_dependents=3,
-            disability_status="none",
-            is_orphan=False,
-            is_single_parent_child=False,
-            is_child_headed_household=False
-        )
-
-    def test_perfect_match_scholarship(self):
-        """Test scholarship that perfectly matches the student"""
-        scholarship = Scholarship.objects.create(
-            title="Perfect Match Scholarship",
-            provider=self.provider,
-            scholarship_type="academic",
-            amount_per_beneficiary=Decimal('100000'),
-            description="A test scholarship for perfect matching",
-            target_education_levels=["undergraduate"],
-            minimum_gpa=Decimal('3.0'),
-            minimum_age=18,
-            maximum_age=30,
-            maximum_family_income=Decimal('600000'),
-            for_males_only=True,  # Changed from gender_restriction="male"
-            target_fields_of_study=["Computer Science", "Engineering"],
-            for_orphans_only=False,
-            for_disabled_only=False,
-            application_start_date=timezone.now(),
-            application_deadline=timezone.now() + timedelta(days=30)
+            date_of_birth=date(2000, 1, 1),
+            previous_gpa=GPA_3_5,
+            previous_percentage=PERCENT_75,
+            family_income_annual=INCOME_500K,
+            county=cls.county
         )
         
-        # Add target county
-        scholarship.target_counties.add(self.county)
-        
-        # Calculate match score
-        score = scholarship.calculate_match_score(self.student)
-        
-        # Should be 100% match
-        self.assertEqual(score, 100.0)
+        # Students needed by individual tests, inserted in one batch
+        cls.orphan_student, cls.disabled_student = StudentFactory.create_batch_bulk(
+            {
+                "date_of_birth": date(2001, 5, 15),
+                "gender": "F",
+                "county": cls.county,
+                "current_education_level": "secondary",
+                "previous_percentage": PERCENT_85,
+                "family_income_annual": INCOME_200K,
+                "is_orphan": True,
+                "is_child_headed_household": True
+            },
+            {
+                "date_of_birth": date(1999, 8, 20),
+                "gender": "O",
+                "county": cls.county,
+                "current_education_level": "diploma",
+                "previous_percentage": PERCENT_82,
+                "family_income_annual": INCOME_350K,
+                "disability_status": "physical",
+                "is_single_parent_child": True
+            },
+        )
 
     def test_partial_match_scholarship(self):
         """Test scholarship with partial match"""
-        scholarship = Scholarship.objects.create(
+        scholarship = ScholarshipFactory(
             title="Partial Match Scholarship",
-            provider=self.provider,
             scholarship_type="academic",
-            amount_per_beneficiary=Decimal('100000'),
-            description="A test scholarship for partial matching",
+            amount_per_beneficiary=AMOUNT_100K,
             target_education_levels=["postgraduate"],  # Student is undergraduate
-            minimum_gpa=Decimal('3.0'),  # Student has 3.5, matches
+            minimum_gpa=GPA_3_0,  # Student has 3.5, matches
             minimum_age=18,
             maximum_age=30,
-            maximum_family_income=Decimal('400000'),  # Student has 500k, doesn't match
+            maximum_family_income=INCOME_400K,  # Student has 500k, doesn't match
             for_males_only=True,  # Student is male, matches
             for_orphans_only=False,
             for_disabled_only=False,
-            application_start_date=timezone.now(),
-            application_deadline=timezone.now() + timedelta(days=30)
+            application_start_date=self.now,
+            application_deadline=self.deadline
         )
         
         # Add target county (matches)
         scholarship.target_counties.add(self.county)
         
         # Calculate match score
-        score = scholarship.calculate_match_score(self.student)
+        with self.assertNumQueries(1), self.record_performance():
+            score = scholarship.calculate_match_score(self.student)
         
         # Should be less than 100% but greater than 0%
         self.assertGreater(score, 0.0)
         self.assertLess(score, 100.0)
-        print(f"Partial match score: {score}%")
 
     def test_no_match_scholarship(self):
         """Test scholarship with no match"""
-        scholarship = Scholarship.objects.create(
+        scholarship = ScholarshipFactory(
             title="No Match Scholarship",
-            provider=self.provider,
             scholarship_type="academic",
-            amount_per_beneficiary=Decimal('100000'),
-            description="A test scholarship with no matching criteria",
+            amount_per_beneficiary=AMOUNT_100K,
             target_education_levels=["phd"],  # Student is undergraduate
-            minimum_gpa=Decimal('3.8'),  # Student has 3.5, doesn't match
+            minimum_gpa=GPA_3_8,  # Student has 3.5, doesn't match
             minimum_age=30,  # Student is 24, doesn't match
             maximum_age=40,
-            maximum_family_income=Decimal('300000'),  # Student has 500k, doesn't match
+            maximum_family_income=INCOME_300K,  # Student has 500k, doesn't match
             for_females_only=True,  # Student is male, doesn't match
             for_orphans_only=True,  # Student is not orphan, doesn't match
             for_disabled_only=False,
-            application_start_date=timezone.now(),
-            application_deadline=timezone.now() + timedelta(days=30)
+            application_start_date=self.now,
+            application_deadline=self.deadline
         )
         
         # Calculate match score
-        score = scholarship.calculate_match_score(self.student)
+        with self.assertNumQueries(1), self.record_performance():
+            score = scholarship.calculate_match_score(self.student)
         
         # Should be 0% match
         self.assertEqual(score, 0.0)
 
     def test_orphan_specific_scholarship(self):
         """Test scholarship specifically for orphans"""
-        # Create orphan student
-        orphan_user = User.objects.create_user(
-            username="orphanstudent",
-            email="orphan@test.com",
-            password="testpass123"
-        )
-        
-        orphan_student = Student.objects.create(
-            user=orphan_user,
-            first_name="Jane",
-            last_name="Smith",
-            date_of_birth=date(2001, 5, 15),
-            gender="F",
-            national_id="87654321",
-            phone_number="+254787654321",
-            email="orphan@test.com",
-            county=self.county,
-            sub_county="Westlands",
-            ward="Parklands",
-            current_education_level="secondary",
-            current_institution="Test High School",
-            course_of_study="Sciences",
-            year_of_study=4,
-            expected_graduation_year=2024,
-            previous_percentage=Decimal('85.0'),
-            family_income_annual=Decimal('200000'),
-            number_of_dependents=2,
-            disability_status="none",
-            is_orphan=True,  # This is an orphan
-            is_single_parent_child=False,
-            is_child_headed_household=True
-        )
-        
-        scholarship = Scholarship.objects.create(
+        scholarship = ScholarshipFactory(
             title="Orphan Support Scholarship",
-            provider=self.provider,
             scholarship_type="need_based",
-            amount_per_beneficiary=Decimal('50000'),
-            description="Scholarship specifically for orphaned students",
+            amount_per_beneficiary=AMOUNT_50K,
             target_education_levels=["secondary"],
-            minimum_percentage=Decimal('80.0'),
+            minimum_percentage=PERCENT_80,
             minimum_age=15,
             maximum_age=25,
-            maximum_family_income=Decimal('300000'),
+            maximum_family_income=INCOME_300K,
             for_females_only=True,
             for_orphans_only=True,  # Only for orphans
             for_disabled_only=False,
             eligibility_criteria={"child_headed_household": True},
-            application_start_date=timezone.now(),
-            application_deadline=timezone.now() + timedelta(days=30)
+            application_start_date=self.now,
+            application_deadline=self.deadline
         )
         
         scholarship.target_counties.add(self.county)
         
         # Test with orphan student
-        orphan_score = scholarship.calculate_match_score(orphan_student)
+        with self.assertNumQueries(1), self.record_performance(record_name='test_orphan_specific_scholarship.orphan'):
+            orphan_score = scholarship.calculate_match_score(self.orphan_student)
         
         # Test with regular student (non-orphan)
-        regular_score = scholarship.calculate_match_score(self.student)
+        with self.assertNumQueries(1), self.record_performance(record_name='test_orphan_specific_scholarship.regular'):
+            regular_score = scholarship.calculate_match_score(self.student)
         
         # Orphan should have higher score
-        self.assertGreater(orphan_score, regular_score)
-        print(f"Orphan student score: {orphan_score}%")
-        print(f"Regular student score: {regular_score}%")
-
-    def test_no_criteria_scholarship(self):
-        """Test scholarship with no specific criteria (should match 100%)"""
-        scholarship = Scholarship.objects.create(
-            title="Open Scholarship",
-            provider=self.provider,
-            scholarship_type="merit",
-            amount_per_beneficiary=Decimal('75000'),
-            description="Open scholarship with no specific criteria",
-            application_start_date=timezone.now(),
-            application_deadline=timezone.now() + timedelta(days=30)
-        )
-        
-        # Calculate match score
-        score = scholarship.calculate_match_score(self.student)
-        
-        # Should be 100% since no criteria to fail
-        self.assertEqual(score, 100.0)
-
-    def test_null_student(self):
-        """Test with null/None student"""
-        scholarship = Scholarship.objects.create(
-            title="Test Scholarship",
-            provider=self.provider,
-            scholarship_type="academic",
-            amount_per_beneficiary=Decimal('100000'),
-            description="Test scholarship",
-            application_start_date=timezone.now(),
-            application_deadline=timezone.now() + timedelta(days=30)
+        self.assertGreater(
+            orphan_score, regular_score,
+            msg=f"orphan={orphan_score}% regular={regular_score}%"
         )
-        
-        # Test with None student
-        score = scholarship.calculate_match_score(None)
-        
-        # Should return 0.0
-        self.assertEqual(score, 0.0)
 
     def test_disabled_student_scholarship(self):
         """Test scholarship for disabled students"""
-        # Create disabled student
-        disabled_user = User.objects.create_user(
-            username="disabledstudent",
-            email="disabled@test.com",
-            password="testpass123"
-        )
-        
-        disabled_student = Student.objects.create(
-            user=disabled_user,
-            first_name="Alex",
-            last_name="Johnson",
-            date_of_birth=date(1999, 8, 20),
-            gender="O",
-            national_id="11223344",
-            phone_number="+254711223344",
-            email="disabled@test.com",
-            county=self.county,
-            sub_county="Westlands",
-            ward="Parklands",
-            current_education_level="diploma",
-            current_institution="Technical College",
-            course_of_study="Information Technology",
-            year_of_study=2,
-            expected_graduation_year=2025,
-            previous_percentage=Decimal('82.0'),
-            family_income_annual=Decimal('350000'),
-            number_of_dependents=1,
-            disability_status="physical",  # Has disability
-            is_orphan=False,
-            is_single_parent_child=True,
-            is_child_headed_household=False
-        )
-        
-        scholarship = Scholarship.objects.create(
+        scholarship = ScholarshipFactory(
             title="Disability Support Scholarship",
-            provider=self.provider,
             scholarship_type="need_based",
-            amount_per_beneficiary=Decimal('80000'),
-            description="Scholarship for students with disabilities",
+            amount_per_beneficiary=AMOUNT_80K,
             target_education_levels=["diploma"],
-            minimum_percentage=Decimal('75.0'),
+            minimum_percentage=PERCENT_75,
             minimum_age=18,
             maximum_age=30,
-            maximum_family_income=Decimal('400000'),
+            maximum_family_income=INCOME_400K,
             for_females_only=False,  # Changed from gender_restriction="any"
             for_males_only=False,
             for_orphans_only=False,
             for_disabled_only=True,  # Only for disabled students
             eligibility_criteria={"single_parent_child": True},
-            application_start_date=timezone.now(),
-            application_deadline=timezone.now() + timedelta(days=30)
+            application_start_date=self.now,
+            application_deadline=self.deadline
         )
         
         scholarship.target_counties.add(self.county)
         
         # Test with disabled student
-        disabled_score = scholarship.calculate_match_score(disabled_student)
+        with self.assertNumQueries(1), self.record_performance(record_name='test_disabled_student_scholarship.disabled'):
+            disabled_score = scholarship.calculate_match_score(self.disabled_student)
         
         # Test with regular student (not disabled)
-        regular_score = scholarship.calculate_match_score(self.student)
+        with self.assertNumQueries(1), self.record_performance(record_name='test_disabled_student_scholarship.regular'):
+            regular_score = scholarship.calculate_match_score(self.student)
         
         # Disabled student should have higher score
-        self.assertGreater(disabled_score, regular_score)
-        print(f"Disabled student score: {disabled_score}%")
-        print(f"Regular student score: {regular_score}%")
+        self.assertGreater(
+            disabled_score, regular_score,
+            msg=f"disabled={disabled_score}% regular={regular_score}%"
+        )
+
+    def test_prefetched_counties_need_no_queries(self):
+        """Test that prefetched target counties are reused without extra queries"""
+        scholarship = ScholarshipFactory(
+            title="Prefetched Scholarship",
+            scholarship_type="academic",
+            amount_per_beneficiary=AMOUNT_100K,
+            target_education_levels=["undergraduate"],
+            application_start_date=self.now,
+            application_deadline=self.deadline
+        )
+        scholarship.target_counties.add(self.county)
+        
+        scholarship = Scholarship.objects.prefetch_related('target_counties').get(pk=scholarship.pk)
+        
+        with self.assertNumQueries(0), self.record_performance():
+            score = scholarship.calculate_match_score(self.student)
+        
+        self.assertEqual(score, 100.0)
+
+    def test_bulk_match_scores(self):
+        """Test that bulk scoring agrees with scoring each student on its own"""
+        other_county = County.objects.exclude(pk=self.county.pk).first() or self.county
+        levels = ["secondary", "diploma", "undergraduate", "postgraduate"]
+        StudentFactory.create_batch_bulk(*[
+            {
+                "date_of_birth": date(1990 + i % 15, 1 + i % 12, 1 + i % 28),
+                "gender": "MFO"[i % 3],
+                "county": self.county if i % 2 else other_county,
+                "current_education_level": levels[i % 4],
+                "course_of_study": ["Computer Science", "Medicine", "Civil Engineering"][i % 3],
+                "previous_gpa": GPA_3_5 if i % 5 == 0 else None,
+                "previous_percentage": [PERCENT_75, PERCENT_85, None][i % 3],
+                "family_income_annual": [INCOME_200K, INCOME_500K][i % 2],
+                "disability_status": "physical" if i % 7 == 0 else "none",
+                "is_orphan": i % 4 == 0,
+                "is_single_parent_child": i % 6 == 0
+            }
+            for i in range(100)
+        ])
+        scholarship = ScholarshipFactory(
+            target_education_levels=["undergraduate", "diploma"],
+            minimum_gpa=GPA_3_0,
+            minimum_percentage=PERCENT_80,
+            minimum_age=20,
+            maximum_age=30,
+            maximum_family_income=INCOME_400K,
+            for_females_only=True,
+            target_fields_of_study=["Engineering", "Computer Science"],
+            for_orphans_only=True,
+            for_disabled_only=True,
+            eligibility_criteria={"single_parent_child": True},
+            application_start_date=self.now,
+            application_deadline=self.deadline
+        )
+        scholarship.target_counties.add(self.county)
+        students = Student.objects.all()
+        
+        with self.assertNumQueries(2):
+            scores = scholarship.calculate_match_scores_bulk(students)
+        
+        expected = {student.pk: scholarship.calculate_match_score(student) for student in students}
+        self.assertEqual(scores, expected)
+
+    def test_annotated_match_points(self):
+        """Test that SQL-annotated scoring agrees with calculate_match_score"""
+        scholarships = [
+            ScholarshipFactory(
+                target_education_levels=["undergraduate", "diploma"],
+                minimum_gpa=GPA_3_0,
+                minimum_percentage=PERCENT_80,
+                minimum_age=20,
+                maximum_age=30,
+                maximum_family_income=INCOME_400K,
+                for_females_only=True,
+                target_fields_of_study=["Engineering", "Computer Science"],
+                for_orphans_only=True,
+                eligibility_criteria={"single_parent_child": True},
+                application_start_date=self.now,
+                application_deadline=self.deadline
+            ),
+            ScholarshipFactory(
+                target_education_levels=["secondary"],
+                minimum_percentage=PERCENT_80,
+                maximum_family_income=INCOME_600K,
+                for_disabled_only=True,
+                eligibility_criteria={"child_headed_household": True},
+                application_start_date=self.now,
+                application_deadline=self.deadline
+            ),
+            ScholarshipFactory(
+                application_start_date=self.now,
+                application_deadline=self.deadline
+            ),
+        ]
+        scholarships[0].target_counties.add(self.county)
+        
+        for student in (self.student, self.orphan_student, self.disabled_student):
+            with self.assertNumQueries(1):
+                annotated = list(Scholarship.annotate_match_points(
+                    Scholarship.objects.filter(pk__in=[s.pk for s in scholarships]).order_by("pk"),
+                    student
+                ))
+            for scholarship in annotated:
+                self.assertEqual(
+                    scholarship.match_score_from_points(student),
+                    scholarship.calculate_match_score(student),
+                    msg=f"{scholarship.title} for {student.first_name}"
+                )
+
+
+class MatchScoreSimpleTestCase(SimpleTestCase):
+    """Test cases that score unsaved objects and never touch the database"""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.county = County(id=47, name="nairobi", code="047", capital_city="Nairobi")
+        cls.student = Student(
+            first_name="John",
+            last_name="Doe",
+            date_of_birth=date(2000, 1, 1),
+            gender="M",
+            county=cls.county,
+            current_education_level="undergraduate",
+            course_of_study="Computer Science",
+            previous_gpa=GPA_3_5,
+            previous_percentage=PERCENT_75,
+            family_income_annual=INCOME_500K,
+            disability_status="none",
+            is_orphan=False,
+            is_single_parent_child=False,
+            is_child_headed_household=False
+        )
+
+    def test_perfect_match_scholarship(self):
+        """Test scholarship that perfectly matches the student"""
+        scholarship = Scholarship(
+            title="Perfect Match Scholarship",
+            scholarship_type="academic",
+            amount_per_beneficiary=AMOUNT_100K,
+            target_education_levels=["undergraduate"],
+            minimum_gpa=GPA_3_0,
+            minimum_age=18,
+            maximum_age=30,
+            maximum_family_income=INCOME_600K,
+            for_males_only=True,
+            target_fields_of_study=["Computer Science", "Engineering"],
+            for_orphans_only=False,
+            for_disabled_only=False
+        )
+        
+        score = scholarship.calculate_match_score(self.student, target_counties=[self.county])
+        
+        # Should be 100% match
+        self.assertEqual(score, 100.0)
+
+    def test_no_criteria_scholarship(self):
+        """Test scholarship with no specific criteria (should match 100%)"""
+        scholarship = Scholarship(
+            title="Open Scholarship",
+            scholarship_type="merit",
+            amount_per_beneficiary=AMOUNT_75K
+        )
+        
+        score = scholarship.calculate_match_score(self.student, target_counties=[])
+        
+        # Should be 100% since no criteria to fail
+        self.assertEqual(score, 100.0)
+
+    def test_null_student(self):
+        """Test with null/None student"""
+        scholarship = Scholarship(
+            title="Test Scholarship",
+            scholarship_type="academic",
+            amount_per_beneficiary=AMOUNT_100K
+        )
+        
+        # Should return 0.0
+        self.assertEqual(scholarship.calculate_match_score(None), 0.0)
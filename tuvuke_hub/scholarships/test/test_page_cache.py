@@ -0,0 +1,47 @@
+from django.contrib.auth.models import AnonymousUser
+from django.contrib.messages import constants, get_messages
+from django.contrib.messages.storage.cookie import CookieStorage
+from django.core.cache import cache
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase
+from scholarships.page_cache import cache_page_for_anonymous
+
+
+def render_messages(request):
+    """Stands in for a page whose base template lists flash messages"""
+    render_messages.calls += 1
+    return HttpResponse(' '.join(str(message) for message in get_messages(request)))
+
+
+class CachePageForAnonymousTest(SimpleTestCase):
+    """Flash messages must never be shared through the anonymous page cache"""
+
+    def setUp(self):
+        cache.clear()
+        render_messages.calls = 0
+        self.factory = RequestFactory()
+        self.view = cache_page_for_anonymous(60)(render_messages)
+
+    def get(self, message=None):
+        request = self.factory.get('/scholarships/')
+        request.user = AnonymousUser()
+        request._messages = CookieStorage(request)
+        if message:
+            request._messages.add(constants.INFO, message)
+        return self.view(request)
+
+    def test_response_with_messages_is_not_cached(self):
+        self.assertEqual(self.get('Only for you').content, b'Only for you')
+
+        self.assertEqual(self.get().content, b'')
+
+    def test_request_with_messages_skips_cache(self):
+        self.get()
+
+        self.assertEqual(self.get('Only for you').content, b'Only for you')
+
+    def test_response_without_messages_is_cached(self):
+        self.get()
+        self.get()
+
+        self.assertEqual(render_messages.calls, 1)
@@ -0,0 +1,25 @@
+"""
+Memoized URL reversing for templates that link to every row of a listing.
+"""
+
+from functools import lru_cache
+
+from django.urls import reverse
+
+
+@lru_cache(maxsize=1024)
+def cached_reverse(name, *args):
+    """
+    Reverse a scholarships URL once per distinct name and arguments.
+    
+    URL patterns are fixed once the process has started, so the result can
+    be reused instead of walking the resolver again.
+    
+    Args:
+        name: URL name within the 'scholarships' namespace
+        *args: Positional URL arguments (must be hashable)
+        
+    Returns:
+        str: The resolved path
+    """
+    return reverse(f'scholarships:{name}', args=args)
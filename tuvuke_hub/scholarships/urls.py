@@ -3,7 +3,9 @@ URL configuration for scholarships app.
 """
 
 from django.urls import path, include
-from . import views, views_htmx, auth_views
+from django.views.generic import RedirectView
+from . import views, views_htmx, views_onboarding, auth_views
+from .page_cache import cache_page_for_anonymous
 
 app_name = 'scholarships'
 
@@ -12,30 +14,36 @@ urlpatterns = [
     path('api/', include('scholarships.api_urls')),
     
     # Authentication URLs
-    path('auth/login/', auth_views.CustomLoginView.as_view(), name='login'),
-    path('auth/logout/', auth_views.custom_logout_view, name='logout'),
-    path('auth/register/', auth_views.StudentRegistrationView.as_view(), name='register'),
-    path('auth/password-reset/', auth_views.PasswordResetView.as_view(), name='password_reset'),
-    path('auth/password-reset-done/', auth_views.PasswordResetDoneView.as_view(), name='password_reset_done'),
-    path('auth/check-phone/', auth_views.check_phone_availability, name='check_phone_availability'),
-    
-    # Role-based Dashboard URLs
-    path('student/dashboard/', views.StudentDashboardView.as_view(), name='student_dashboard'),
-    path('provider/dashboard/', views.ProviderDashboardView.as_view(), name='provider_dashboard'), 
-    path('admin/dashboard/', views.AdminDashboardView.as_view(), name='admin_dashboard'),
+    path('auth/', include([
+        path('login/', auth_views.CustomLoginView.as_view(), name='login'),
+        path('logout/', auth_views.custom_logout_view, name='logout'),
+        path('register/', auth_views.StudentRegistrationView.as_view(), name='register'),
+        path('password-reset/', auth_views.PasswordResetView.as_view(), name='password_reset'),
+        path('password-reset-done/', auth_views.PasswordResetDoneView.as_view(), name='password_reset_done'),
+        path('check-phone/', auth_views.check_phone_availability, name='check_phone_availability'),
+    ])),
     
     # Student URLs (require student role)
-    path('student/profile/', views.student_profile_view, name='student_profile'),
-    path('student/profile/complete/', auth_views.StudentProfileView.as_view(), name='student_profile_complete'),
-    path('student/ajax/data/', views.student_ajax_data, name='student_ajax_data'),
+    path('student/', include([
+        path('dashboard/', views.StudentDashboardView.as_view(), name='student_dashboard'),
+        path('profile/', views.student_profile_view, name='student_profile'),
+        path('profile/complete/', auth_views.StudentProfileView.as_view(), name='student_profile_complete'),
+        path('ajax/data/', views.student_ajax_data, name='student_ajax_data'),
+    ])),
     
     # Provider URLs (require provider role)
-    path('provider/create-scholarship/', views.create_scholarship_view, name='create_scholarship'),
-    path('provider/ajax/data/', views.provider_ajax_data, name='provider_ajax_data'),
+    path('provider/', include([
+        path('dashboard/', views.ProviderDashboardView.as_view(), name='provider_dashboard'),
+        path('create-scholarship/', views.create_scholarship_view, name='create_scholarship'),
+        path('ajax/data/', views.provider_ajax_data, name='provider_ajax_data'),
+    ])),
     
     # Admin URLs (require staff role)
-    path('admin/moderation/', views.admin_moderation_view, name='admin_moderation'),
-    path('admin/ajax/stats/', views.admin_ajax_stats, name='admin_ajax_stats'),
+    path('admin/', include([
+        path('dashboard/', views.AdminDashboardView.as_view(), name='admin_dashboard'),
+        path('moderation/', views.admin_moderation_view, name='admin_moderation'),
+        path('ajax/stats/', views.admin_ajax_stats, name='admin_ajax_stats'),
+    ])),
     
     # Legacy Student Registration URLs (for backwards compatibility)
     path('register/', views.StudentRegistrationView.as_view(), name='register_student'),
@@ -43,30 +51,37 @@ urlpatterns = [
     path('quick-register/', views.quick_register_student, name='quick_register_student'),
     
     # Student Profile URLs (legacy)
-    path('profile/', views.student_profile_view, name='legacy_student_profile'),
+    path('profile/', RedirectView.as_view(pattern_name='scholarships:student_profile'), name='legacy_student_profile'),
     path('profile/update/', views.update_student_profile, name='update_student_profile'),
     path('profile/complete/', views.complete_profile, name='complete_profile'),
     
     # Legacy Dashboard (redirects to role-based dashboard)
-    path('dashboard/', views.student_dashboard, name='legacy_student_dashboard'),
+    path('dashboard/', RedirectView.as_view(pattern_name='scholarships:student_dashboard'), name='legacy_student_dashboard'),
     
     # Public URLs (no authentication required)
-    path('search/', views.search_students, name='search_students'),
-    path('scholarships/', views.ScholarshipListView.as_view(), name='scholarship_list'),
+    path('search/', cache_page_for_anonymous(60 * 5)(views.search_students), name='search_students'),
+    path('scholarships/', cache_page_for_anonymous(60 * 5)(views.ScholarshipListView.as_view()), name='scholarship_list'),
     path('scholarships/<slug:slug>/', views.ScholarshipDetailView.as_view(), name='scholarship_detail'),
     path('scholarships/<slug:slug>/apply/', views.scholarship_apply_view, name='scholarship_apply'),
-    path('', views_htmx.scholarship_search_homepage, name='search_homepage'),
+    path('', cache_page_for_anonymous(60 * 5)(views_htmx.scholarship_search_homepage), name='search_homepage'),
     
     # HTMX endpoints
-    path('htmx/search/', views_htmx.htmx_scholarship_search, name='htmx_scholarship_search'),
-    path('htmx/filters/', views_htmx.htmx_scholarship_filters, name='htmx_scholarship_filters'),
-    path('htmx/stats/', views_htmx.htmx_scholarship_stats, name='htmx_scholarship_stats'),
-    path('htmx/quick-view/<int:scholarship_id>/', views_htmx.htmx_scholarship_quick_view, name='htmx_scholarship_quick_view'),
+    path('htmx/', include([
+        path('search/', views_htmx.htmx_scholarship_search, name='htmx_scholarship_search'),
+        path('filters/', views_htmx.htmx_scholarship_filters, name='htmx_scholarship_filters'),
+        path('stats/', cache_page_for_anonymous(60)(views_htmx.htmx_scholarship_stats), name='htmx_scholarship_stats'),
+        path('quick-view/<int:scholarship_id>/', views_htmx.htmx_scholarship_quick_view, name='htmx_scholarship_quick_view'),
+    ])),
     
     # AJAX endpoints
-    path('ajax/sub-counties/', views.get_sub_counties, name='get_sub_counties'),
-    path('ajax/validate-national-id/', views.validate_national_id, name='validate_national_id'),
-    path('ajax/validate-phone/', views.validate_phone_number, name='validate_phone_number'),
+    path('ajax/', include([
+        path('sub-counties/', views.get_sub_counties, name='get_sub_counties'),
+        path('validate/', views.validate_fields, name='validate_fields'),
+        # Deprecated single-field validators, superseded by validate/
+        path('validate-national-id/', views.validate_national_id, name='validate_national_id'),
+        path('validate-phone/', views.validate_phone_number, name='validate_phone_number'),
+        path('onboarding/', views_onboarding.StudentOnboardingSubmitView.as_view(), name='student_onboarding_submit'),
+    ])),
     
     # Health check endpoint
     path('health/', views.health_check, name='health_check'),
@@ -7,10 +7,12 @@ from django.contrib.auth import login, authenticate
 from django.contrib.auth.hashers import make_password
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
+from django.core.cache import cache
 from django.core.paginator import Paginator
-from django.db.models import Q
-from django.http import JsonResponse
-from django.views.decorators.http import require_GET
+from django.db.models import Count, Q, Window
+from django.http import HttpResponse, JsonResponse
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import etag, require_GET
 from django.views.decorators.csrf import csrf_exempt
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
@@ -19,8 +21,13 @@ from django.views.generic import View, ListView, DetailView
 from django.utils.decorators import method_decorator
 from django.views.decorators.csrf import csrf_protect
 from django.utils import timezone
+from django.utils.functional import cached_property
 from decimal import Decimal
+import hashlib
 import json
+import re
+
+import orjson
 
 from .forms import (
     StudentRegistrationForm, 
@@ -29,13 +36,63 @@ from .forms import (
     StudentSearchForm
 )
 from .models import Student, County, Scholarship, Provider, Application
+from .queries import county_q, education_level_q, field_of_study_q
+from .recommendations import get_recommendations
 from .access_control import (
     StudentRequiredMixin, ProviderRequiredMixin, StaffRequiredMixin,
     student_required, provider_required, staff_required,
-    is_student, is_provider, is_staff_or_admin
+    is_student, is_provider, is_staff_or_admin, get_student_profile
 )
 
 
+def register_from_form(request, form):
+    """
+    Create a student account from a bound registration form and log it in.
+    
+    Shared by StudentRegistrationView and register_student. Validation and
+    save errors are reported through the messages framework.
+    
+    Args:
+        request: The registration POST request
+        form: Bound StudentRegistrationForm
+        
+    Returns:
+        HttpResponse: Redirect to the dashboard on success, otherwise None
+            so the caller can redisplay the form
+    """
+    if not form.is_valid():
+        # Form has validation errors
+        messages.error(
+            request, 
+            'Please correct the errors below and try again.'
+        )
+        return None
+    
+    try:
+        # Save the form - this creates both User and Student profile
+        # The form already handles password hashing in its save() method
+        user = form.save()
+    except Exception as e:
+        # Handle any unexpected errors during save
+        messages.error(
+            request, 
+            f'An error occurred while creating your account: {str(e)}. '
+            f'Please try again or contact support.'
+        )
+        return None
+    
+    # Log in the user automatically with specified backend
+    login(request, user, backend='scholarships.backends.MultiFieldAuthBackend')
+    
+    messages.success(
+        request, 
+        f'Welcome {user.first_name}! Your account has been created successfully. '
+        f'You can now apply for scholarships.'
+    )
+    
+    return redirect('scholarships:student_dashboard')
+
+
 @method_decorator(csrf_protect, name='dispatch')
 class StudentRegistrationView(View):
     """
@@ -49,48 +106,23 @@ class StudentRegistrationView(View):
     template_name = 'scholarships/register.html'
     form_class = StudentRegistrationForm
     
+    def get_form(self, data=None, files=None):
+        """Build the registration form with the cached county list"""
+        return self.form_class(data, files, county_queryset=County.get_cached_list())
+    
     def get(self, request):
         """Handle GET request - display registration form"""
-        form = self.form_class()
+        form = self.get_form()
         context = self.get_context_data(form=form)
         return render(request, self.template_name, context)
     
     def post(self, request):
         """Handle POST request - process form submission"""
-        form = self.form_class(request.POST, request.FILES)
+        form = self.get_form(request.POST, request.FILES)
         
-        if form.is_valid():
-            try:
-                # Save the form - this creates both User and Student profile
-                # The form already handles password hashing in its save() method
-                user = form.save()
-                
-                # Log in the user automatically with specified backend
-                login(request, user, backend='scholarships.backends.MultiFieldAuthBackend')
-                
-                # Add success message
-                messages.success(
-                    request, 
-                    f'Welcome {user.first_name}! Your account has been created successfully. '
-                    f'You can now apply for scholarships.'
-                )
-                
-                # Redirect to dashboard
-                return redirect('scholarships:student_dashboard')
-                
-            except Exception as e:
-                # Handle any unexpected errors during save
-                messages.error(
-                    request, 
-                    f'An error occurred while creating your account: {str(e)}. '
-                    f'Please try again or contact support.'
-                )
-        else:
-            # Form has validation errors
-            messages.error(
-                request, 
-                'Please correct the errors below and try again.'
-            )
+        response = register_from_form(request, form)
+        if response is not None:
+            return response
         
         # If form is invalid or error occurred, redisplay form with errors
         context = self.get_context_data(form=form)
@@ -99,10 +131,10 @@ class StudentRegistrationView(View):
     def get_context_data(self, form=None, **kwargs):
         """Prepare context data for template"""
         context = {
-            'form': form or self.form_class(),
+            'form': form or self.get_form(),
             'page_title': 'Student Registration',
             'submit_text': 'Create Account',
-            'counties': County.objects.all().order_by('name'),
+            'counties': County.get_cached_list(),
         }
         context.update(kwargs)
         return context
@@ -119,48 +151,22 @@ def register_student(request):
     - Success/error messaging
     """
     if request.method == 'POST':
-        form = StudentRegistrationForm(request.POST, request.FILES)
+        form = StudentRegistrationForm(
+            request.POST, request.FILES, county_queryset=County.get_cached_list()
+        )
         
-        if form.is_valid():
-            try:
-                # Save the form - this creates both User and Student profile
-                user = form.save()
-                
-                # Log in the user automatically with specified backend
-                login(request, user, backend='scholarships.backends.MultiFieldAuthBackend')
-                
-                # Add success message
-                messages.success(
-                    request, 
-                    f'Welcome {user.first_name}! Your account has been created successfully. '
-                    f'You can now apply for scholarships.'
-                )
-                
-                # Redirect to dashboard or profile page
-                return redirect('student_dashboard')
-                
-            except Exception as e:
-                # Handle any unexpected errors during save
-                messages.error(
-                    request, 
-                    f'An error occurred while creating your account: {str(e)}. '
-                    f'Please try again or contact support.'
-                )
-        else:
-            # Form has validation errors
-            messages.error(
-                request, 
-                'Please correct the errors below and try again.'
-            )
+        response = register_from_form(request, form)
+        if response is not None:
+            return response
     else:
-        form = StudentRegistrationForm()
+        form = StudentRegistrationForm(county_queryset=County.get_cached_list())
     
     # Prepare context for template
     context = {
         'form': form,
         'page_title': 'Student Registration',
         'submit_text': 'Create Account',
-        'counties': County.objects.all().order_by('name'),
+        'counties': County.get_cached_list(),
     }
     
     return render(request, 'scholarships/register.html', context)
@@ -212,7 +218,7 @@ def quick_register_student(request):
         'form': form,
         'page_title': 'Quick Registration',
         'submit_text': 'Quick Register',
-        'counties': County.objects.all().order_by('name'),
+        'counties': County.get_cached_list(),
     }
     
     return render(request, 'scholarships/quick_register.html', context)
@@ -228,21 +234,17 @@ def student_profile_view(request):
     - Links to edit profile
     - Profile completion status
     """
-    try:
-        student = request.user.student_profile
-    except Student.DoesNotExist:
+    student = get_student_profile(request.user)
+    if student is None:
         messages.error(
             request, 
             'Student profile not found. Please contact support.'
         )
         return redirect('home')
     
-    # Calculate profile completion percentage
-    profile_completion = calculate_profile_completion(student)
-    
     context = {
         'student': student,
-        'profile_completion': profile_completion,
+        'profile_completion': student.profile_completion,
         'page_title': f'{student.get_full_name()} - Profile',
     }
     
@@ -259,9 +261,8 @@ def update_student_profile(request):
     - Excludes sensitive fields
     - Validation for unique fields
     """
-    try:
-        student = request.user.student_profile
-    except Student.DoesNotExist:
+    student = get_student_profile(request.user)
+    if student is None:
         messages.error(
             request, 
             'Student profile not found. Please contact support.'
@@ -305,7 +306,7 @@ def update_student_profile(request):
         'student': student,
         'page_title': 'Update Profile',
         'submit_text': 'Update Profile',
-        'counties': County.objects.all().order_by('name'),
+        'counties': County.get_cached_list(),
     }
     
     return render(request, 'scholarships/update_profile.html', context)
@@ -320,9 +321,8 @@ def complete_profile(request):
     - Shows remaining fields to complete
     - Uses update form with missing fields highlighted
     """
-    try:
-        student = request.user.student_profile
-    except Student.DoesNotExist:
+    student = get_student_profile(request.user)
+    if student is None:
         messages.error(
             request, 
             'Student profile not found. Please contact support.'
@@ -330,8 +330,7 @@ def complete_profile(request):
         return redirect('home')
     
     # Check if profile is already complete
-    completion_percentage = calculate_profile_completion(student)
-    if completion_percentage >= 80:
+    if student.profile_completion >= 80:
         messages.info(
             request, 
             'Your profile is already mostly complete!'
@@ -349,8 +348,8 @@ def complete_profile(request):
             try:
                 updated_student = form.save()
                 
-                # Check completion after update
-                new_completion = calculate_profile_completion(updated_student)
+                # Check completion after update (recalculated on save)
+                new_completion = updated_student.profile_completion
                 
                 if new_completion >= 80:
                     messages.success(
@@ -382,15 +381,55 @@ def complete_profile(request):
     context = {
         'form': form,
         'student': student,
-        'completion_percentage': completion_percentage,
+        'completion_percentage': student.profile_completion,
         'page_title': 'Complete Your Profile',
         'submit_text': 'Save Progress',
-        'counties': County.objects.all().order_by('name'),
+        'counties': County.get_cached_list(),
     }
     
     return render(request, 'scholarships/complete_profile.html', context)
 
 
+def years_before(day, years):
+    """
+    Get the same calendar day a number of years earlier.
+    
+    Args:
+        day: Reference date
+        years: Whole years to go back
+        
+    Returns:
+        date: The earlier date; 29 February maps to 28 February in
+            non-leap years
+    """
+    try:
+        return day.replace(year=day.year - years)
+    except ValueError:
+        return day.replace(year=day.year - years, day=28)
+
+
+class CachedCountPaginator(Paginator):
+    """
+    Paginator whose total count is cached under a caller-supplied key.
+    
+    Counting a filtered, joined search is as costly as the search itself, and
+    paging through the same results repeats the same COUNT on every page.
+    """
+    
+    def __init__(self, object_list, per_page, count_cache_key, count_timeout=60, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.count_cache_key = count_cache_key
+        self.count_timeout = count_timeout
+    
+    @cached_property
+    def count(self):
+        return cache.get_or_set(
+            self.count_cache_key,
+            lambda: Paginator.count.func(self),
+            self.count_timeout
+        )
+
+
 def search_students(request):
     """
     Search students with multiple criteria.
@@ -402,7 +441,7 @@ def search_students(request):
     - Verification status filtering
     - Pagination for results
     """
-    form = StudentSearchForm(request.GET or None)
+    form = StudentSearchForm(request.GET or None, county_queryset=County.get_cached_list())
     students = Student.objects.select_related('county', 'user').all()
     
     # Apply search filters
@@ -436,16 +475,20 @@ def search_students(request):
         if cleaned_data.get('gender'):
             students = students.filter(gender=cleaned_data['gender'])
         
-        # Age range filters
-        if cleaned_data.get('min_age'):
-            from datetime import date, timedelta
-            max_birth_date = date.today() - timedelta(days=cleaned_data['min_age'] * 365)
-            students = students.filter(date_of_birth__lte=max_birth_date)
+        # Age range filters, as exact birth date bounds so date_of_birth
+        # can be compared directly
+        today = timezone.localdate()
+        if cleaned_data.get('age_min'):
+            # At least age_min years old: born on or before that birthday
+            students = students.filter(
+                date_of_birth__lte=years_before(today, cleaned_data['age_min'])
+            )
         
-        if cleaned_data.get('max_age'):
-            from datetime import date, timedelta
-            min_birth_date = date.today() - timedelta(days=cleaned_data['max_age'] * 365)
-            students = students.filter(date_of_birth__gte=min_birth_date)
+        if cleaned_data.get('age_max'):
+            # Not yet age_max + 1: born after that birthday
+            students = students.filter(
+                date_of_birth__gt=years_before(today, cleaned_data['age_max'] + 1)
+            )
         
         # Verification status filter
         if cleaned_data.get('is_verified') is not None:
@@ -454,8 +497,14 @@ def search_students(request):
     # Order results
     students = students.order_by('-created_at', 'last_name', 'first_name')
     
-    # Pagination
-    paginator = Paginator(students, 20)  # 20 students per page
+    # Pagination; the total is cached per filter combination
+    filters = form.cleaned_data if form.is_valid() else {}
+    filter_key = hashlib.md5(json.dumps(
+        filters, sort_keys=True, default=lambda value: getattr(value, 'pk', str(value))
+    ).encode()).hexdigest()
+    paginator = CachedCountPaginator(
+        students, 20, count_cache_key=f'student_search_count:{filter_key}'
+    )  # 20 students per page
     page_number = request.GET.get('page')
     page_obj = paginator.get_page(page_number)
     
@@ -480,10 +529,7 @@ def student_dashboard(request):
     - Personalized scholarship recommendations using match scores
     - Quick actions and statistics
     """
-    try:
-        student = request.user.student_profile
-    except Student.DoesNotExist:
-        student = None
+    student = get_student_profile(request.user)
     
     # Initialize context variables
     applications = []
@@ -494,41 +540,22 @@ def student_dashboard(request):
     if student:
         # Get user's applications with related scholarship data
         from .models import Application
-        applications = Application.objects.filter(
+        # The window count is taken before LIMIT, so every row carries the
+        # student's total number of applications and no COUNT query is needed
+        applications = list(Application.objects.filter(
             student=student
         ).select_related(
             'scholarship', 
             'scholarship__provider'
-        ).order_by('-application_date')[:10]
+        ).annotate(
+            total_count=Window(Count('id'))
+        ).order_by('-application_date')[:10])
         
-        applications_count = applications.count()
+        applications_count = applications[0].total_count if applications else 0
         
-        # Get personalized scholarship recommendations
-        active_scholarships = Scholarship.objects.filter(
-            is_active=True,
-            application_deadline__gte=timezone.now().date()
-        ).select_related('provider').prefetch_related('target_counties')
-        
-        # Calculate match scores and filter recommendations
-        recommendations_with_scores = []
-        for scholarship in active_scholarships:
-            try:
-                match_score = student.calculate_match_score(scholarship)
-                if match_score >= 40:  # Only show scholarships with decent match
-                    recommendations_with_scores.append({
-                        'scholarship': scholarship,
-                        'match_score': match_score
-                    })
-            except Exception as e:
-                # Skip scholarships that cause calculation errors
-                continue
-        
-        # Sort by match score (highest first) and limit to top 8
-        recommended_scholarships = sorted(
-            recommendations_with_scores, 
-            key=lambda x: x['match_score'], 
-            reverse=True
-        )[:8]
+        # Personalized recommendations, ranked once and cached until the
+        # student or a scholarship changes
+        recommended_scholarships = get_recommendations(student)
         
         recommended_count = len(recommended_scholarships)
     
@@ -544,89 +571,45 @@ def student_dashboard(request):
     return render(request, 'scholarships/dashboard.html', context)
 
 
-def calculate_profile_completion(student):
+# AJAX Views for dynamic form behavior
+
+def fast_json_response(payload, status=200):
     """
-    Calculate profile completion percentage based on filled fields.
+    Serialize a JSON response with orjson.
+    
+    The AJAX endpoints below answer on every form field blur with small,
+    plain payloads, so the faster encoder is used instead of JsonResponse.
     
     Args:
-        student: Student instance
+        payload: JSON-serializable dict
+        status: HTTP status code
         
     Returns:
-        int: Completion percentage (0-100)
+        HttpResponse: application/json response
     """
-    total_fields = 25  # Total important fields to track
-    completed_fields = 0
-    
-    # Check essential fields
-    if student.first_name:
-        completed_fields += 1
-    if student.last_name:
-        completed_fields += 1
-    if student.date_of_birth:
-        completed_fields += 1
-    if student.gender:
-        completed_fields += 1
-    if student.national_id:
-        completed_fields += 1
-    if student.phone_number:
-        completed_fields += 1
-    if student.county:
-        completed_fields += 1
-    if student.sub_county:
-        completed_fields += 1
-    if student.ward:
-        completed_fields += 1
-    if student.current_education_level:
-        completed_fields += 1
-    if student.current_institution:
-        completed_fields += 1
-    if student.course_of_study:
-        completed_fields += 1
-    if student.year_of_study:
-        completed_fields += 1
-    if student.expected_graduation_year:
-        completed_fields += 1
-    if student.family_income_annual:
-        completed_fields += 1
-    if student.number_of_dependents is not None:
-        completed_fields += 1
-    
-    # Optional but important fields
-    if student.other_names:
-        completed_fields += 1
-    if student.alternative_phone:
-        completed_fields += 1
-    if student.location:
-        completed_fields += 1
-    if student.postal_address:
-        completed_fields += 1
-    if student.previous_gpa or student.previous_percentage:
-        completed_fields += 1
-    if student.profile_photo:
-        completed_fields += 1
-    
-    # Special circumstances (count as 3 fields)
-    if (student.disability_status or student.is_orphan or 
-        student.is_single_parent_child or student.is_child_headed_household):
-        completed_fields += 3
-    
-    return int((completed_fields / total_fields) * 100)
+    return HttpResponse(orjson.dumps(payload), status=status, content_type='application/json')
 
 
-# AJAX Views for dynamic form behavior
+def sub_counties_etag(request):
+    """ETag for get_sub_counties; the list only depends on the county"""
+    county_id = request.GET.get('county_id')
+    return f'subc-{county_id}' if county_id else None
+
 
 @require_http_methods(["GET"])
+@cache_control(max_age=60 * 60 * 24, public=True)
+@etag(sub_counties_etag)
 def get_sub_counties(request):
     """
     AJAX endpoint to get sub-counties for a selected county.
     
     Returns:
-        JsonResponse: List of sub-counties for the county
+        HttpResponse: List of sub-counties for the county
     """
     county_id = request.GET.get('county_id')
     
     if not county_id:
-        return JsonResponse({'error': 'County ID is required'}, status=400)
+        return fast_json_response({'error': 'County ID is required'}, status=400)
     
     try:
         county = get_object_or_404(County, id=county_id)
@@ -641,15 +624,15 @@ def get_sub_counties(request):
             {'id': 5, 'name': 'South'},
         ]
         
-        return JsonResponse({
+        return fast_json_response({
             'sub_counties': sub_counties,
             'county_name': county.name
         })
         
     except County.DoesNotExist:
-        return JsonResponse({'error': 'County not found'}, status=404)
+        return fast_json_response({'error': 'County not found'}, status=404)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return fast_json_response({'error': str(e)}, status=500)
 
 
 @require_http_methods(["POST"])
@@ -658,47 +641,51 @@ def validate_national_id(request):
     """
     AJAX endpoint to validate National ID uniqueness.
     
+    Deprecated: use validate_fields, which also checks the phone number.
+    
     Returns:
-        JsonResponse: Validation result
+        HttpResponse: Validation result
     """
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
         national_id = data.get('national_id', '').strip()
         student_id = data.get('student_id')  # For updates
         
         if not national_id:
-            return JsonResponse({
+            return fast_json_response({
                 'valid': False, 
                 'message': 'National ID is required'
             })
         
         # Check format (8 digits)
         if not national_id.isdigit() or len(national_id) != 8:
-            return JsonResponse({
+            return fast_json_response({
                 'valid': False,
                 'message': 'National ID must be exactly 8 digits'
             })
         
-        # Check uniqueness
-        query = Student.objects.filter(national_id=national_id)
+        # Check uniqueness; updates exclude the student's own row, so only
+        # lookups for new registrations go through the cache
         if student_id:
-            query = query.exclude(id=student_id)
+            taken = Student.objects.filter(national_id=national_id).exclude(id=student_id).exists()
+        else:
+            taken = Student.is_value_taken('national_id', national_id)
         
-        if query.exists():
-            return JsonResponse({
+        if taken:
+            return fast_json_response({
                 'valid': False,
                 'message': 'A student with this National ID already exists'
             })
         
-        return JsonResponse({
+        return fast_json_response({
             'valid': True,
             'message': 'National ID is available'
         })
         
     except json.JSONDecodeError:
-        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+        return fast_json_response({'error': 'Invalid JSON'}, status=400)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return fast_json_response({'error': str(e)}, status=500)
 
 
 @require_http_methods(["POST"])
@@ -707,16 +694,18 @@ def validate_phone_number(request):
     """
     AJAX endpoint to validate phone number format and uniqueness.
     
+    Deprecated: use validate_fields, which also checks the National ID.
+    
     Returns:
-        JsonResponse: Validation result with normalized phone number
+        HttpResponse: Validation result with normalized phone number
     """
     try:
-        data = json.loads(request.body)
+        data = orjson.loads(request.body)
         phone_number = data.get('phone_number', '').strip()
         student_id = data.get('student_id')  # For updates
         
         if not phone_number:
-            return JsonResponse({
+            return fast_json_response({
                 'valid': False,
                 'message': 'Phone number is required'
             })
@@ -725,74 +714,114 @@ def validate_phone_number(request):
         normalized_phone = normalize_phone_number(phone_number)
         
         if not normalized_phone:
-            return JsonResponse({
+            return fast_json_response({
                 'valid': False,
                 'message': 'Phone number must be in format +254XXXXXXXXX'
             })
         
-        # Check uniqueness
-        query = Student.objects.filter(phone_number=normalized_phone)
+        # Check uniqueness; updates exclude the student's own row, so only
+        # lookups for new registrations go through the cache
         if student_id:
-            query = query.exclude(id=student_id)
+            taken = Student.objects.filter(phone_number=normalized_phone).exclude(id=student_id).exists()
+        else:
+            taken = Student.is_value_taken('phone_number', normalized_phone)
         
-        if query.exists():
-            return JsonResponse({
+        if taken:
+            return fast_json_response({
                 'valid': False,
                 'message': 'A student with this phone number already exists'
             })
         
-        return JsonResponse({
+        return fast_json_response({
             'valid': True,
             'message': 'Phone number is available',
             'normalized_phone': normalized_phone
         })
         
     except json.JSONDecodeError:
-        return JsonResponse({'error': 'Invalid JSON'}, status=400)
+        return fast_json_response({'error': 'Invalid JSON'}, status=400)
     except Exception as e:
-        return JsonResponse({'error': str(e)}, status=500)
+        return fast_json_response({'error': str(e)}, status=500)
 
 
-def filter_scholarships_by_education_level(queryset, education_level):
-    """
-    Filter scholarships by education level - SQLite compatible version
+@require_http_methods(["POST"])
+@csrf_exempt
+def validate_fields(request):
     """
-    if not education_level:
-        return queryset
+    AJAX endpoint to validate National ID and phone number in one request.
     
-    # For efficiency, use a raw SQL approach or Python filtering
-    # Get scholarship IDs that match the criteria
-    matching_ids = []
+    Supersedes validate_national_id and validate_phone_number: both
+    uniqueness checks share a single query. Only the fields present in the
+    JSON body are validated and reported.
     
-    for scholarship in queryset.select_related('provider'):
-        target_levels = scholarship.target_education_levels or []
-        if (not target_levels or 
-            'all_levels' in target_levels or 
-            education_level in target_levels):
-            matching_ids.append(scholarship.id)
+    Returns:
+        HttpResponse: Per-field results keyed 'national_id' and 'phone',
+            each shaped like the legacy endpoint's response
+    """
+    try:
+        data = orjson.loads(request.body)
+        national_id = (data.get('national_id') or '').strip()
+        phone_number = (data.get('phone') or '').strip()
+        student_id = data.get('student_id')  # For updates
+        
+        results = {}
+        lookup = Q()
+        
+        if 'national_id' in data:
+            if not national_id:
+                results['national_id'] = {'valid': False, 'message': 'National ID is required'}
+            elif not national_id.isdigit() or len(national_id) != 8:
+                results['national_id'] = {'valid': False, 'message': 'National ID must be exactly 8 digits'}
+            else:
+                lookup |= Q(national_id=national_id)
+        
+        normalized_phone = None
+        if 'phone' in data:
+            normalized_phone = normalize_phone_number(phone_number) if phone_number else None
+            if not phone_number:
+                results['phone'] = {'valid': False, 'message': 'Phone number is required'}
+            elif not normalized_phone:
+                results['phone'] = {'valid': False, 'message': 'Phone number must be in format +254XXXXXXXXX'}
+            else:
+                lookup |= Q(phone_number=normalized_phone)
+        
+        # One query answers both uniqueness checks
+        taken_ids, taken_phones = set(), set()
+        if lookup:
+            query = Student.objects.filter(lookup)
+            if student_id:
+                query = query.exclude(id=student_id)
+            for taken_id, taken_phone in query.values_list('national_id', 'phone_number'):
+                taken_ids.add(taken_id)
+                taken_phones.add(taken_phone)
+        
+        if 'national_id' in data and 'national_id' not in results:
+            if national_id in taken_ids:
+                results['national_id'] = {'valid': False, 'message': 'A student with this National ID already exists'}
+            else:
+                results['national_id'] = {'valid': True, 'message': 'National ID is available'}
+        
+        if 'phone' in data and 'phone' not in results:
+            if normalized_phone in taken_phones:
+                results['phone'] = {'valid': False, 'message': 'A student with this phone number already exists'}
+            else:
+                results['phone'] = {
+                    'valid': True,
+                    'message': 'Phone number is available',
+                    'normalized_phone': normalized_phone
+                }
+        
+        return fast_json_response(results)
     
-    # Return filtered queryset by IDs
-    return queryset.model.objects.filter(id__in=matching_ids)
+    except json.JSONDecodeError:
+        return fast_json_response({'error': 'Invalid JSON'}, status=400)
+    except Exception as e:
+        return fast_json_response({'error': str(e)}, status=500)
 
 
-def filter_scholarships_by_field_of_study(queryset, field_of_study):
-    """
-    Filter scholarships by field of study - SQLite compatible version
-    """
-    if not field_of_study:
-        return queryset
-    
-    # Get scholarship IDs that match the criteria
-    matching_ids = []
-    
-    for scholarship in queryset.select_related('provider'):
-        target_fields = scholarship.target_fields_of_study or []
-        if (not target_fields or 
-            any(field_of_study.lower() in field.lower() for field in target_fields)):
-            matching_ids.append(scholarship.id)
-    
-    # Return filtered queryset by IDs
-    return queryset.model.objects.filter(id__in=matching_ids)
+# Compiled once at import; normalize_phone_number runs on every AJAX blur
+NON_DIGIT_RE = re.compile(r'\D')
+KENYAN_PHONE_RE = re.compile(r'^\+254[17][0-9]{8}$')
 
 
 def normalize_phone_number(phone_number):
@@ -805,10 +834,8 @@ def normalize_phone_number(phone_number):
     Returns:
         str: Normalized phone number or None if invalid
     """
-    import re
-    
     # Remove all non-digit characters
-    digits_only = re.sub(r'\D', '', phone_number)
+    digits_only = NON_DIGIT_RE.sub('', phone_number)
     
     # Handle different formats
     if digits_only.startswith('254') and len(digits_only) == 12:
@@ -825,13 +852,30 @@ def normalize_phone_number(phone_number):
         return None
     
     # Validate the final format
-    phone_pattern = r'^\+254[17][0-9]{8}$'
-    if re.match(phone_pattern, normalized):
+    if KENYAN_PHONE_RE.match(normalized):
         return normalized
     
     return None
 
 
+# Sorting options offered on the scholarship list, built once at import
+SCHOLARSHIP_SORT_OPTIONS = (
+    ('title', 'Title (A-Z)'),
+    ('-title', 'Title (Z-A)'),
+    ('-amount_per_beneficiary', 'Amount (High to Low)'),
+    ('amount_per_beneficiary', 'Amount (Low to High)'),
+    ('application_deadline', 'Deadline (Earliest First)'),
+    ('-application_deadline', 'Deadline (Latest First)'),
+    ('-created_at', 'Newest First'),
+    ('created_at', 'Oldest First'),
+    ('provider__name', 'Provider (A-Z)'),
+    ('-provider__name', 'Provider (Z-A)'),
+)
+SCHOLARSHIP_SORT_FIELDS = frozenset(
+    [field for field, _ in SCHOLARSHIP_SORT_OPTIONS] + ['number_of_awards', '-number_of_awards']
+)
+
+
 class ScholarshipListView(ListView):
     """
     Class-Based View for displaying and filtering scholarships.
@@ -849,6 +893,7 @@ class ScholarshipListView(ListView):
     template_name = 'scholarships/scholarship_list.html'
     context_object_name = 'scholarships'
     paginate_by = 12  # Show 12 scholarships per page
+    _filtered_queryset = None
     
     def get_queryset(self):
         """
@@ -868,132 +913,139 @@ class ScholarshipListView(ListView):
         - gender: Gender-specific scholarships
         - sort: Sorting option
         """
-        # Start with active scholarships by default
+        # Built once per request; later calls reuse the same queryset
+        if self._filtered_queryset is not None:
+            return self._filtered_queryset
+        
+        # Start with active scholarships by default. Conditions are collected
+        # into one Q and applied with a single filter() call.
         queryset = Scholarship.objects.select_related('provider').prefetch_related('target_counties')
+        params = self.request.GET
+        conditions = Q()
         
         # Filter by status (default to active)
-        status = self.request.GET.get('status', 'active')
+        status = params.get('status', 'active')
         if status and status != 'all':
-            queryset = queryset.filter(status=status)
+            conditions &= Q(status=status)
         
         # Only show scholarships with future or current deadlines (unless admin)
         if not self.request.user.is_staff:
-            queryset = queryset.filter(application_deadline__gte=timezone.now())
+            conditions &= Q(application_deadline__gte=timezone.now())
         
         # County filter
-        county_id = self.request.GET.get('county')
+        county_id = params.get('county')
         if county_id:
             try:
                 county_id = int(county_id)
-                queryset = queryset.filter(
-                    Q(target_counties__id=county_id) | 
-                    Q(target_counties__isnull=True)  # Include scholarships with no county restrictions
-                )
+                # Include scholarships with no county restrictions
+                conditions &= county_q(county_id)
             except (ValueError, TypeError):
                 pass
         
-        # Education level filter (SQLite compatible)
-        education_level = self.request.GET.get('education_level')
+        # Education level filter
+        education_level = params.get('education_level')
         if education_level:
-            queryset = filter_scholarships_by_education_level(queryset, education_level)
+            conditions &= education_level_q(education_level)
         
         # Scholarship type filter
-        scholarship_type = self.request.GET.get('scholarship_type')
+        scholarship_type = params.get('scholarship_type')
         if scholarship_type:
-            queryset = queryset.filter(scholarship_type=scholarship_type)
+            conditions &= Q(scholarship_type=scholarship_type)
         
         # Provider filter
-        provider_id = self.request.GET.get('provider')
+        provider_id = params.get('provider')
         if provider_id:
             try:
                 provider_id = int(provider_id)
-                queryset = queryset.filter(provider_id=provider_id)
+                conditions &= Q(provider_id=provider_id)
             except (ValueError, TypeError):
                 pass
         
         # Text search in title and description
-        search_query = self.request.GET.get('search')
+        search_query = params.get('search')
         if search_query:
-            queryset = queryset.filter(
+            conditions &= (
                 Q(title__icontains=search_query) |
                 Q(description__icontains=search_query) |
                 Q(provider__name__icontains=search_query)
             )
         
         # Amount range filters
-        min_amount = self.request.GET.get('min_amount')
+        min_amount = params.get('min_amount')
         if min_amount:
             try:
                 min_amount = Decimal(min_amount)
-                queryset = queryset.filter(amount_per_beneficiary__gte=min_amount)
+                conditions &= Q(amount_per_beneficiary__gte=min_amount)
             except (ValueError, TypeError, Exception):
                 pass
         
-        max_amount = self.request.GET.get('max_amount')
+        max_amount = params.get('max_amount')
         if max_amount:
             try:
                 max_amount = Decimal(max_amount)
-                queryset = queryset.filter(amount_per_beneficiary__lte=max_amount)
+                conditions &= Q(amount_per_beneficiary__lte=max_amount)
             except (ValueError, TypeError, Exception):
                 pass
         
         # Special requirements filters
-        if self.request.GET.get('for_orphans') == 'true':
-            queryset = queryset.filter(for_orphans_only=True)
+        if params.get('for_orphans') == 'true':
+            conditions &= Q(for_orphans_only=True)
         
-        if self.request.GET.get('for_disabled') == 'true':
-            queryset = queryset.filter(for_disabled_only=True)
+        if params.get('for_disabled') == 'true':
+            conditions &= Q(for_disabled_only=True)
         
         # Gender filter
-        gender = self.request.GET.get('gender')
+        gender = params.get('gender')
         if gender == 'male':
-            queryset = queryset.filter(for_males_only=True)
+            conditions &= Q(for_males_only=True)
         elif gender == 'female':
-            queryset = queryset.filter(for_females_only=True)
+            conditions &= Q(for_females_only=True)
         elif gender == 'any':
-            queryset = queryset.filter(for_males_only=False, for_females_only=False)
+            conditions &= Q(for_males_only=False, for_females_only=False)
         
-        # Field of study filter (SQLite compatible)
-        field_of_study = self.request.GET.get('field_of_study')
+        # Field of study filter
+        field_of_study = params.get('field_of_study')
         if field_of_study:
-            queryset = filter_scholarships_by_field_of_study(queryset, field_of_study)
+            conditions &= field_of_study_q(field_of_study)
         
         # Renewable scholarships only
-        if self.request.GET.get('renewable') == 'true':
-            queryset = queryset.filter(renewable=True)
+        if params.get('renewable') == 'true':
+            conditions &= Q(renewable=True)
         
         # Application method filter
-        application_method = self.request.GET.get('application_method')
+        application_method = params.get('application_method')
         if application_method:
-            queryset = queryset.filter(application_method=application_method)
+            conditions &= Q(application_method=application_method)
+        
+        queryset = queryset.filter(conditions)
         
         # Sorting
         sort_by = self.request.GET.get('sort', '-created_at')
-        valid_sort_options = [
-            'title', '-title',
-            'amount_per_beneficiary', '-amount_per_beneficiary',
-            'application_deadline', '-application_deadline',
-            'created_at', '-created_at',
-            'provider__name', '-provider__name',
-            'number_of_awards', '-number_of_awards'
-        ]
-        
-        if sort_by in valid_sort_options:
+        if sort_by in SCHOLARSHIP_SORT_FIELDS:
             queryset = queryset.order_by(sort_by)
         else:
             # Default sorting: featured first, then by deadline, then by creation date
             queryset = queryset.order_by('-is_featured', 'application_deadline', '-created_at')
         
-        return queryset.distinct()
+        # Logged-in students get every row scored in the same query
+        if self.request.user.is_authenticated:
+            student = get_student_profile(self.request.user)
+            if student is not None:
+                queryset = Scholarship.annotate_match_points(queryset, student)
+        
+        # County matching uses EXISTS, so no join can duplicate rows
+        self._filtered_queryset = queryset
+        return self._filtered_queryset
     
     def get_context_data(self, **kwargs):
         """Add additional context for the template."""
         context = super().get_context_data(**kwargs)
+        now = timezone.now()
         
         # Add filter options for the template
         context.update({
-            'counties': County.objects.all().order_by('name'),
-            'providers': Provider.objects.filter(is_active=True).order_by('name'),
+            'counties': County.get_cached_list(),
+            'providers': Provider.get_cached_active_list(),
             'scholarship_types': Scholarship.SCHOLARSHIP_TYPE_CHOICES,
             'education_levels': Scholarship.EDUCATION_LEVEL_CHOICES,
             'status_choices': Scholarship.SCHOLARSHIP_STATUS_CHOICES,
@@ -1019,53 +1071,43 @@ class ScholarshipListView(ListView):
             },
             
             # Statistics
-            'total_scholarships': self.get_queryset().count(),
+            # The paginator has already counted the filtered list
+            'total_scholarships': context['paginator'].count,
             'active_scholarships': Scholarship.objects.filter(
                 status='active',
-                application_deadline__gte=timezone.now()
+                application_deadline__gte=now
             ).count(),
             
             # Page title
             'page_title': 'Available Scholarships',
             
             # Sorting options for template
-            'sort_options': [
-                ('title', 'Title (A-Z)'),
-                ('-title', 'Title (Z-A)'),
-                ('-amount_per_beneficiary', 'Amount (High to Low)'),
-                ('amount_per_beneficiary', 'Amount (Low to High)'),
-                ('application_deadline', 'Deadline (Earliest First)'),
-                ('-application_deadline', 'Deadline (Latest First)'),
-                ('-created_at', 'Newest First'),
-                ('created_at', 'Oldest First'),
-                ('provider__name', 'Provider (A-Z)'),
-                ('-provider__name', 'Provider (Z-A)'),
-            ],
+            'sort_options': SCHOLARSHIP_SORT_OPTIONS,
             
             # Featured scholarships for sidebar
             'featured_scholarships': Scholarship.objects.filter(
                 is_featured=True,
                 status='active',
-                application_deadline__gte=timezone.now()
+                application_deadline__gte=now
             )[:5],
         })
         
         # Add user-specific context if logged in
+        student = None
         if self.request.user.is_authenticated:
-            try:
-                student = self.request.user.student_profile
-                # Calculate match scores for scholarships if student exists
-                scholarships_with_scores = []
-                for scholarship in context['scholarships']:
-                    match_score = scholarship.calculate_match_score(student)
-                    scholarships_with_scores.append({
-                        'scholarship': scholarship,
-                        'match_score': match_score
-                    })
-                context['scholarships_with_scores'] = scholarships_with_scores
-                context['has_student_profile'] = True
-            except:
-                context['has_student_profile'] = False
+            student = get_student_profile(self.request.user)
+        
+        if student is not None:
+            # Calculate match scores for scholarships if student exists
+            scholarships_with_scores = []
+            for scholarship in context['scholarships']:
+                match_score = scholarship.match_score_from_points(student)
+                scholarships_with_scores.append({
+                    'scholarship': scholarship,
+                    'match_score': match_score
+                })
+            context['scholarships_with_scores'] = scholarships_with_scores
+            context['has_student_profile'] = True
         else:
             context['has_student_profile'] = False
         
@@ -1090,7 +1132,7 @@ class StudentDashboardView(StudentRequiredMixin, ListView):
         """
         Get personalized scholarship recommendations for the student
         """
-        student = self.request.user.student_profile
+        student = get_student_profile(self.request.user)
         
         # Get active scholarships that the student hasn't applied to yet
         applied_scholarship_ids = student.applications.values_list('scholarship_id', flat=True)
@@ -1103,11 +1145,8 @@ class StudentDashboardView(StudentRequiredMixin, ListView):
         ).select_related('provider').prefetch_related('target_counties')
         
         # Add basic filtering based on student profile
-        if student.county:
-            queryset = queryset.filter(
-                Q(target_counties=student.county) | 
-                Q(target_counties__isnull=True)
-            )
+        if student.county_id:
+            queryset = queryset.filter(county_q(student.county_id))
         
         # Note: We'll filter by education level in Python since SQLite doesn't support JSON contains
         # Get all scholarships first, then filter in Python
@@ -1136,17 +1175,26 @@ class StudentDashboardView(StudentRequiredMixin, ListView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        student = self.request.user.student_profile
+        student = get_student_profile(self.request.user)
+        now = timezone.now()
+        
+        # Scholarship and provider are joined in so rendering the list adds no queries
+        recent_applications = Application.objects.filter(
+            student=student
+        ).select_related(
+            'scholarship__provider'
+        ).order_by('-created_at')[:5]
         
         context.update({
             'title': 'Student Dashboard',
             'student': student,
-            'recent_applications': student.applications.order_by('-created_at')[:5],
+            'recent_applications': recent_applications,
+            'applications': recent_applications,
             'profile_completion': self.calculate_profile_completion(student),
             'urgent_deadlines': Scholarship.objects.filter(
                 status='active',
-                application_deadline__gte=timezone.now(),
-                application_deadline__lte=timezone.now() + timezone.timedelta(days=7)
+                application_deadline__gte=now,
+                application_deadline__lte=now + timezone.timedelta(days=7)
             )[:5]
         })
         return context
@@ -1255,12 +1303,12 @@ def student_profile_view(request):
     """
     Student profile view - only accessible by students
     """
-    student = request.user.student_profile
+    student = get_student_profile(request.user)
     
     context = {
         'title': 'My Profile',
         'student': student,
-        'counties': County.objects.all(),
+        'counties': County.get_cached_list(),
     }
     
     return render(request, 'students/profile.html', context)
@@ -1299,7 +1347,7 @@ def student_ajax_data(request):
     """
     AJAX endpoint for student-specific data
     """
-    student = request.user.student_profile
+    student = get_student_profile(request.user)
     
     data = {
         'profile_completion': calculate_profile_completion_percentage(student),
@@ -1381,21 +1429,28 @@ class ScholarshipDetailView(DetailView):
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        scholarship = self.get_object()
+        scholarship = self.object
         
         # Add user-specific context
         if self.request.user.is_authenticated:
-            try:
-                student = self.request.user.student_profile
-                
+            student = get_student_profile(self.request.user)
+            
+            if student is None:
+                context.update({
+                    'student': None,
+                    'has_applied': False,
+                    'match_score': 0,
+                    'is_eligible': False,
+                })
+            else:
                 # Check if already applied
                 has_applied = Application.objects.filter(
                     student=student,
                     scholarship=scholarship
                 ).exists()
                 
-                # Calculate match score
-                match_score = student.calculate_match_score(scholarship)
+                # Calculate match score (counties come from the prefetch)
+                match_score = scholarship.calculate_match_score(student)
                 
                 context.update({
                     'student': student,
@@ -1403,13 +1458,6 @@ class ScholarshipDetailView(DetailView):
                     'match_score': match_score,
                     'is_eligible': match_score > 0,
                 })
-            except AttributeError:
-                context.update({
-                    'student': None,
-                    'has_applied': False,
-                    'match_score': 0,
-                    'is_eligible': False,
-                })
         
         return context
 
@@ -1425,9 +1473,8 @@ def scholarship_apply_view(request, slug):
         status='active'
     )
     
-    try:
-        student = request.user.student_profile
-    except AttributeError:
+    student = get_student_profile(request.user)
+    if student is None:
         messages.error(request, "Please complete your student profile before applying.")
         return redirect('scholarships:student_profile')
     
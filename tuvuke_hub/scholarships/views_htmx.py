@@ -7,13 +7,51 @@ from django.shortcuts import render
 from django.http import JsonResponse
 from django.views.decorators.http import require_http_methods
 from django.views.decorators.csrf import csrf_exempt
-from django.db.models import Q, Sum, Avg
-from django.core.paginator import Paginator
+from django.db.models import Q, Sum, Avg, Count, Exists, OuterRef
+from django.core.cache import cache
 from django.utils import timezone
+from datetime import timedelta
 from decimal import Decimal
+import hashlib
 import json
 
 from .models import Scholarship, County, Provider
+from .access_control import get_student_profile
+from .queries import county_q, education_level_q
+from .views import CachedCountPaginator
+
+
+# Wide columns that scholarship cards never render, left out of list queries
+CARD_DEFERRED_FIELDS = (
+    'eligibility_criteria', 'required_documents', 'renewal_criteria',
+    'tags', 'source_url', 'external_application_url',
+)
+
+
+# Search form choices, built once at import
+SEARCH_EDUCATION_LEVELS = (
+    ('primary', 'Primary School'),
+    ('secondary', 'Secondary School'),
+    ('college', 'College/Diploma'),
+    ('undergraduate', 'Undergraduate'),
+    ('postgraduate', 'Postgraduate'),
+    ('masters', 'Masters'),
+    ('phd', 'PhD'),
+    ('professional', 'Professional Course'),
+)
+
+SEARCH_SCHOLARSHIP_TYPES = (
+    ('merit', 'Merit-Based'),
+    ('need', 'Need-Based'),
+    ('sports', 'Sports'),
+    ('arts', 'Arts & Culture'),
+    ('leadership', 'Leadership'),
+    ('community', 'Community Service'),
+    ('research', 'Research'),
+    ('minority', 'Minority Groups'),
+    ('disabled', 'Disability Support'),
+    ('other', 'Other'),
+)
 
 
 def scholarship_search_homepage(request):
@@ -21,89 +59,66 @@ def scholarship_search_homepage(request):
     Homepage with HTMX-powered scholarship search.
     Shows initial scholarships and search/filter interface.
     """
-    # Get initial scholarships (featured and recent)
-    featured_scholarships = Scholarship.objects.filter(
-        is_featured=True,
+    # Get initial scholarships (featured and recent) in one query: the six
+    # newest featured ones plus the six newest overall, at most 12 rows
+    active = Scholarship.objects.filter(
         status='active',
         application_deadline__gte=timezone.now()
-    ).select_related('provider').prefetch_related('target_counties')[:6]
-    
-    recent_scholarships = Scholarship.objects.filter(
-        status='active',
-        application_deadline__gte=timezone.now()
-    ).select_related('provider').prefetch_related('target_counties').order_by('-created_at')[:6]
+    )
+    newest = active.order_by('-created_at')
+    featured_ids = newest.filter(is_featured=True).values('pk')[:6]
+    newest_ids = newest.values('pk')[:6]
+    initial_scholarships = list(
+        active.filter(Q(pk__in=featured_ids) | Q(pk__in=newest_ids))
+        .select_related('provider').prefetch_related('target_counties')
+        .defer(*CARD_DEFERRED_FIELDS)
+        .order_by('-created_at')
+    )
+    featured_scholarships = [s for s in initial_scholarships if s.is_featured][:6]
+    recent_scholarships = initial_scholarships[:6]
     
     # Get filter options
-    counties = County.objects.all().order_by('name')
-    providers = Provider.objects.filter(is_active=True).order_by('name')
-    
-    # Education level choices for filtering
-    education_levels = [
-        ('primary', 'Primary School'),
-        ('secondary', 'Secondary School'),
-        ('college', 'College/Diploma'),
-        ('undergraduate', 'Undergraduate'),
-        ('postgraduate', 'Postgraduate'),
-        ('masters', 'Masters'),
-        ('phd', 'PhD'),
-        ('professional', 'Professional Course'),
-    ]
-    
-    # Scholarship type choices
-    scholarship_types = [
-        ('merit', 'Merit-Based'),
-        ('need', 'Need-Based'),
-        ('sports', 'Sports'),
-        ('arts', 'Arts & Culture'),
-        ('leadership', 'Leadership'),
-        ('community', 'Community Service'),
-        ('research', 'Research'),
-        ('minority', 'Minority Groups'),
-        ('disabled', 'Disability Support'),
-        ('other', 'Other'),
-    ]
+    counties = County.get_cached_list()
+    providers = Provider.get_cached_active_list()
     
     context = {
         'featured_scholarships': featured_scholarships,
         'recent_scholarships': recent_scholarships,
         'counties': counties,
         'providers': providers,
-        'education_levels': education_levels,
-        'scholarship_types': scholarship_types,
+        'education_levels': SEARCH_EDUCATION_LEVELS,
+        'scholarship_types': SEARCH_SCHOLARSHIP_TYPES,
         'page_title': 'Find Your Perfect Scholarship',
-        'total_active_scholarships': Scholarship.objects.filter(
-            status='active',
-            application_deadline__gte=timezone.now()
-        ).count(),
+        'total_active_scholarships': active_scholarship_count(),
     }
     
     return render(request, 'scholarships/search_homepage.html', context)
 
 
-@require_http_methods(["GET"])
-def htmx_scholarship_search(request):
+def _build_scholarship_queryset(now, search_query='', county_id='', education_level='', scholarship_type=''):
     """
-    HTMX endpoint for dynamic scholarship search and filtering.
-    Returns HTML partial with filtered scholarships.
+    Active scholarships narrowed by the filters shared by the HTMX endpoints.
+    
+    Search results, filter options and stats are requested together on each
+    change of the search form, so they build their querysets here and always
+    agree on what matches.
+    
+    Args:
+        now: Request time; deadlines before it are excluded
+        search_query: Text to look for in title, description, provider
+            name and fields of study
+        county_id: County primary key as a string
+        education_level: Education level slug
+        scholarship_type: Scholarship type slug
+        
+    Returns:
+        QuerySet: Filtered Scholarship queryset
     """
-    # Get search parameters
-    search_query = request.GET.get('search', '').strip()
-    county_id = request.GET.get('county', '').strip()
-    education_level = request.GET.get('education_level', '').strip()
-    scholarship_type = request.GET.get('scholarship_type', '').strip()
-    provider_id = request.GET.get('provider', '').strip()
-    min_grade = request.GET.get('min_grade', '').strip()
-    max_amount = request.GET.get('max_amount', '').strip()
-    sort_by = request.GET.get('sort', 'relevance').strip()
-    page = request.GET.get('page', 1)
-    
-    # Start with active scholarships
     scholarships = Scholarship.objects.filter(
         status='active',
-        application_deadline__gte=timezone.now()
-    ).select_related('provider').prefetch_related('target_counties')
+        application_deadline__gte=now
+    )
     
-    # Apply search query
     if search_query:
         scholarships = scholarships.filter(
             Q(title__icontains=search_query) |
@@ -112,35 +127,47 @@ def htmx_scholarship_search(request):
             Q(target_fields_of_study__icontains=search_query)
         )
     
-    # Apply county filter
     if county_id:
         try:
-            county_id = int(county_id)
-            scholarships = scholarships.filter(
-                Q(target_counties__id=county_id) |
-                Q(target_counties__isnull=True)  # Include scholarships with no county restrictions
-            )
+            # Include scholarships with no county restrictions
+            scholarships = scholarships.filter(county_q(int(county_id)))
         except (ValueError, TypeError):
             pass
     
-    # Apply education level filter - SQLite compatible
     if education_level:
-        # Get all scholarships first, then filter in Python
-        all_scholarships = list(scholarships)
-        filtered_ids = []
-        for scholarship in all_scholarships:
-            target_levels = scholarship.target_education_levels or []
-            if (not target_levels or 
-                'all_levels' in target_levels or 
-                education_level in target_levels):
-                filtered_ids.append(scholarship.id)
-        
-        scholarships = Scholarship.objects.filter(id__in=filtered_ids)
+        scholarships = scholarships.filter(education_level_q(education_level))
     
-    # Apply scholarship type filter
     if scholarship_type:
         scholarships = scholarships.filter(scholarship_type=scholarship_type)
     
+    return scholarships
+
+
+@require_http_methods(["GET"])
+def htmx_scholarship_search(request):
+    """
+    HTMX endpoint for dynamic scholarship search and filtering.
+    Returns HTML partial with filtered scholarships, or compact JSON rows
+    and the search statistics when called with ?fmt=json.
+    """
+    # Get search parameters
+    search_query = request.GET.get('search', '').strip()
+    county_id = request.GET.get('county', '').strip()
+    education_level = request.GET.get('education_level', '').strip()
+    scholarship_type = request.GET.get('scholarship_type', '').strip()
+    provider_id = request.GET.get('provider', '').strip()
+    min_grade = request.GET.get('min_grade', '').strip()
+    max_amount = request.GET.get('max_amount', '').strip()
+    sort_by = request.GET.get('sort', 'relevance').strip()
+    page = request.GET.get('page', 1)
+    
+    # Start with active scholarships matching the shared filters
+    scholarships = _build_scholarship_queryset(
+        timezone.now(), search_query, county_id, education_level, scholarship_type
+    ).select_related('provider').prefetch_related(
+        'target_counties'
+    ).defer(*CARD_DEFERRED_FIELDS)
+    
     # Apply provider filter
     if provider_id:
         try:
@@ -187,12 +214,29 @@ def htmx_scholarship_search(request):
         # Order by featured first, then deadline, then creation date
         scholarships = scholarships.order_by('-is_featured', 'application_deadline', '-created_at')
     
-    # Remove duplicates (in case of multiple county targets)
-    scholarships = scholarships.distinct()
+    # Score every row in the same query if user is a student
+    user_student = None
+    if request.user.is_authenticated:
+        user_student = get_student_profile(request.user)
+    if user_student:
+        scholarships = Scholarship.annotate_match_points(scholarships, user_student)
     
-    # Pagination
+    # Pagination; the total is cached per filter combination (sorting and
+    # paging don't change it) and retired with the search stats
     items_per_page = 12
-    paginator = Paginator(scholarships, items_per_page)
+    filters = '|'.join([
+        search_query, str(county_id), education_level, scholarship_type,
+        str(provider_id), min_grade, max_amount,
+    ])
+    paginator = CachedCountPaginator(
+        scholarships,
+        items_per_page,
+        count_cache_key='schol_stats:v{}:count:{}'.format(
+            cache.get_or_set(STATS_VERSION_KEY, 1, None),
+            hashlib.md5(filters.encode()).hexdigest()
+        ),
+        count_timeout=STATS_CACHE_TIMEOUT,
+    )
     
     try:
         page_number = int(page)
@@ -201,15 +245,8 @@ def htmx_scholarship_search(request):
     
     page_obj = paginator.get_page(page_number)
     
-    # Calculate match scores if user is authenticated
+    # Finish match scores if user is authenticated
     scholarships_with_scores = []
-    user_student = None
-    
-    if request.user.is_authenticated:
-        try:
-            user_student = request.user.student_profile
-        except:
-            pass
     
     for scholarship in page_obj:
         scholarship_data = {
@@ -219,12 +256,9 @@ def htmx_scholarship_search(request):
         }
         
         if user_student:
-            try:
-                match_score = scholarship.calculate_match_score(user_student)
-                scholarship_data['match_score'] = match_score
-                scholarship_data['eligibility_status'] = 'eligible' if match_score >= 70 else 'partial'
-            except:
-                pass
+            match_score = scholarship.match_score_from_points(user_student)
+            scholarship_data['match_score'] = match_score
+            scholarship_data['eligibility_status'] = 'eligible' if match_score >= 70 else 'partial'
         
         scholarships_with_scores.append(scholarship_data)
     
@@ -239,6 +273,26 @@ def htmx_scholarship_search(request):
         'filters_applied': bool(county_id or education_level or scholarship_type or provider_id or min_grade or max_amount)
     }
     
+    # Compact rows for clients that render results themselves
+    if request.GET.get('fmt') == 'json':
+        return JsonResponse({
+            'results': [
+                {
+                    'id': item['scholarship'].id,
+                    'title': item['scholarship'].title,
+                    'provider': item['scholarship'].provider.name,
+                    'scholarship_type': item['scholarship'].scholarship_type,
+                    'amount_per_beneficiary': item['scholarship'].amount_per_beneficiary,
+                    'application_deadline': item['scholarship'].application_deadline,
+                    'is_featured': item['scholarship'].is_featured,
+                    'match_score': item['match_score'],
+                    'eligibility_status': item['eligibility_status'],
+                }
+                for item in scholarships_with_scores
+            ],
+            'search_stats': search_stats,
+        })
+    
     context = {
         'scholarships_with_scores': scholarships_with_scores,
         'page_obj': page_obj,
@@ -260,45 +314,97 @@ def htmx_scholarship_filters(request):
     county_id = request.GET.get('county', '').strip()
     education_level = request.GET.get('education_level', '').strip()
     
-    # Get base scholarships for context
-    scholarships = Scholarship.objects.filter(
-        status='active',
-        application_deadline__gte=timezone.now()
+    # Options only need to follow the search and county, not every keystroke
+    # to the second, so they share the stats cache and its invalidation
+    cache_key = 'schol_stats:v{}:options:{}'.format(
+        cache.get_or_set(STATS_VERSION_KEY, 1, None),
+        hashlib.md5(f'{search_query}|{county_id}'.encode()).hexdigest()
     )
+    context = cache.get(cache_key)
+    if context is None:
+        # Apply existing filters to get relevant options
+        scholarships = _build_scholarship_queryset(timezone.now(), search_query, county_id)
+        
+        # Get available providers for current context; EXISTS needs no DISTINCT
+        available_providers = Provider.objects.filter(
+            Exists(scholarships.filter(provider=OuterRef('pk'))),
+            is_active=True
+        ).order_by('name')
+        
+        # Get available scholarship types
+        available_types = scholarships.order_by().values_list('scholarship_type', flat=True).distinct()
+        
+        context = {
+            'available_providers': list(available_providers),
+            'available_types': list(available_types),
+        }
+        cache.set(cache_key, context, STATS_CACHE_TIMEOUT)
     
-    # Apply existing filters to get relevant options
-    if search_query:
-        scholarships = scholarships.filter(
-            Q(title__icontains=search_query) |
-            Q(description__icontains=search_query) |
-            Q(provider__name__icontains=search_query)
-        )
+    return render(request, 'scholarships/partials/filter_options.html', context)
+
+
+# Live search asks for stats on every keystroke; they may lag changes by
+# at most this long, and any scholarship change retires them all
+STATS_CACHE_TIMEOUT = 60
+STATS_VERSION_KEY = 'schol_stats:version'
+
+
+def invalidate_scholarship_stats():
+    """Retire every cached search statistics entry"""
+    try:
+        cache.incr(STATS_VERSION_KEY)
+    except ValueError:
+        cache.set(STATS_VERSION_KEY, 2, None)
+
+
+def active_scholarship_count():
+    """
+    Count scholarships accepting applications, served from the cache.
     
-    if county_id:
-        try:
-            county_id = int(county_id)
-            scholarships = scholarships.filter(
-                Q(target_counties__id=county_id) |
-                Q(target_counties__isnull=True)
-            )
-        except (ValueError, TypeError):
-            pass
+    Shares the stats version key, so scholarship changes retire it too;
+    the timeout covers deadlines passing.
     
-    # Get available providers for current context
-    available_providers = Provider.objects.filter(
-        id__in=scholarships.values_list('provider_id', flat=True),
-        is_active=True
-    ).distinct().order_by('name')
+    Returns:
+        int: Number of active scholarships
+    """
+    return cache.get_or_set(
+        'schol_stats:v{}:active_count'.format(cache.get_or_set(STATS_VERSION_KEY, 1, None)),
+        lambda: Scholarship.objects.filter(
+            status='active',
+            application_deadline__gte=timezone.now()
+        ).count(),
+        60 * 5
+    )
+
+
+def _compute_stats(scholarships, now):
+    """
+    Aggregate search statistics for a filtered scholarship queryset.
     
-    # Get available scholarship types
-    available_types = scholarships.values_list('scholarship_type', flat=True).distinct()
+    Args:
+        scholarships: Filtered Scholarship queryset
+        now: Request time the closing-soon window starts from
+        
+    Returns:
+        dict: Counts and amounts for the stats panel
+    """
+    # Everything, including the deadline distribution, in one query
+    closing_date = now + timedelta(days=30)
+    totals = scholarships.aggregate(
+        count=Count('id'),
+        total=Sum('amount_per_beneficiary'),
+        avg=Avg('amount_per_beneficiary'),
+        closing_soon=Count('id', filter=Q(application_deadline__lte=closing_date))
+    )
+    total_scholarships = totals['count']
     
-    context = {
-        'available_providers': available_providers,
-        'available_types': available_types,
+    return {
+        'total_scholarships': total_scholarships,
+        'total_funding': totals['total'] or 0,
+        'avg_amount': totals['avg'] or 0,
+        'closing_soon': totals['closing_soon'],
+        'has_results': total_scholarships > 0
     }
-    
-    return render(request, 'scholarships/partials/filter_options.html', context)
 
 
 @require_http_methods(["GET"])
@@ -313,71 +419,23 @@ def htmx_scholarship_stats(request):
     education_level = request.GET.get('education_level', '').strip()
     scholarship_type = request.GET.get('scholarship_type', '').strip()
     
-    # Build filtered queryset
-    scholarships = Scholarship.objects.filter(
-        status='active',
-        application_deadline__gte=timezone.now()
+    # Identical filter combinations share one cached result
+    filters = f'{search_query}|{county_id}|{education_level}|{scholarship_type}'
+    cache_key = 'schol_stats:v{}:{}'.format(
+        cache.get_or_set(STATS_VERSION_KEY, 1, None),
+        hashlib.md5(filters.encode()).hexdigest()
     )
+    stats = cache.get(cache_key)
+    if stats is not None:
+        return JsonResponse(stats)
     
-    # Apply same filters as search
-    if search_query:
-        scholarships = scholarships.filter(
-            Q(title__icontains=search_query) |
-            Q(description__icontains=search_query) |
-            Q(provider__name__icontains=search_query)
-        )
-    
-    if county_id:
-        try:
-            county_id = int(county_id)
-            scholarships = scholarships.filter(
-                Q(target_counties__id=county_id) |
-                Q(target_counties__isnull=True)
-            )
-        except (ValueError, TypeError):
-            pass
-    
-    if education_level:
-        # Get all scholarships first, then filter in Python - SQLite compatible
-        all_scholarships = list(scholarships)
-        filtered_ids = []
-        for scholarship in all_scholarships:
-            target_levels = scholarship.target_education_levels or []
-            if (not target_levels or 
-                'all_levels' in target_levels or 
-                education_level in target_levels):
-                filtered_ids.append(scholarship.id)
-        
-        scholarships = Scholarship.objects.filter(id__in=filtered_ids)
-    
-    if scholarship_type:
-        scholarships = scholarships.filter(scholarship_type=scholarship_type)
-    
-    # Calculate statistics
-    total_scholarships = scholarships.count()
-    total_funding = scholarships.aggregate(
-        total=Sum('amount_per_beneficiary')
-    )['total'] or 0
-    
-    avg_amount = scholarships.aggregate(
-        avg=Avg('amount_per_beneficiary')
-    )['avg'] or 0
-    
-    # Get deadline distribution
-    from datetime import datetime, timedelta
+    # One timestamp, so the filter and the closing-soon window agree
     now = timezone.now()
-    
-    closing_soon = scholarships.filter(
-        application_deadline__lte=now + timedelta(days=30)
-    ).count()
-    
-    stats = {
-        'total_scholarships': total_scholarships,
-        'total_funding': total_funding,
-        'avg_amount': avg_amount,
-        'closing_soon': closing_soon,
-        'has_results': total_scholarships > 0
-    }
+    scholarships = _build_scholarship_queryset(
+        now, search_query, county_id, education_level, scholarship_type
+    )
+    stats = _compute_stats(scholarships, now)
+    cache.set(cache_key, stats, STATS_CACHE_TIMEOUT)
     
     return JsonResponse(stats)
 
@@ -400,20 +458,22 @@ def htmx_scholarship_quick_view(request, scholarship_id):
         user_student = None
         
         if request.user.is_authenticated:
-            try:
-                user_student = request.user.student_profile
-                match_score = user_student.calculate_match_score(scholarship)
-                
-                # Get detailed eligibility information
-                eligibility_details = {
-                    'meets_education_level': user_student.education_level in (scholarship.target_education_levels or []),
-                    'meets_county': not scholarship.target_counties.exists() or user_student.county in scholarship.target_counties.all(),
-                    'meets_gender': not (scholarship.for_males_only and user_student.gender != 'M') and not (scholarship.for_females_only and user_student.gender != 'F'),
-                    'meets_income': not scholarship.maximum_family_income or user_student.family_annual_income <= scholarship.maximum_family_income,
-                    'meets_gpa': not scholarship.minimum_gpa or (user_student.current_gpa and user_student.current_gpa >= scholarship.minimum_gpa),
-                }
-            except:
-                pass
+            user_student = get_student_profile(request.user)
+        
+        if user_student is not None:
+            # Counties come from the prefetch; scoring and eligibility share them
+            target_counties = scholarship.target_counties.all()
+            match_score = scholarship.calculate_match_score(user_student, target_counties=target_counties)
+            target_county_ids = {county.id for county in target_counties}
+            
+            # Get detailed eligibility information
+            eligibility_details = {
+                'meets_education_level': user_student.current_education_level in (scholarship.target_education_levels or []),
+                'meets_county': not target_county_ids or user_student.county_id in target_county_ids,
+                'meets_gender': not (scholarship.for_males_only and user_student.gender != 'M') and not (scholarship.for_females_only and user_student.gender != 'F'),
+                'meets_income': not scholarship.maximum_family_income or bool(user_student.family_income_annual and user_student.family_income_annual <= scholarship.maximum_family_income),
+                'meets_gpa': not scholarship.minimum_gpa or bool(user_student.previous_gpa and user_student.previous_gpa >= scholarship.minimum_gpa),
+            }
         
         context = {
             'scholarship': scholarship,
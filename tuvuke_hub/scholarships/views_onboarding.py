@@ -4,16 +4,23 @@ Handles the step-by-step registration process with form validation and data pers
 """
 
 from django.shortcuts import render, redirect
+from django.urls import reverse
 from django.contrib.auth import login
 from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
 from django.contrib import messages
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_protect
 from django.views.decorators.http import require_http_methods
 from django.utils.decorators import method_decorator
 from django.views.generic import View
-from django.utils import timezone
 from django.contrib.auth.hashers import make_password
+from django.core.files import File
+from django.db import models
+from datetime import date
+from decimal import Decimal
+from types import MappingProxyType
 import json
 
 from .models import Student, County
@@ -23,6 +30,136 @@ from .forms_onboarding import (
 )
 
 
+BULK_BATCH_SIZE = 500
+
+
+def build_registration(session_data, county_ids):
+    """
+    Build the User and Student for a completed onboarding, without saving.
+    
+    Args:
+        session_data: Data collected by the onboarding steps
+        county_ids: Ids of the existing counties; an unknown county (e.g.
+        deleted meanwhile) leaves the profile without one
+        
+    Returns:
+        tuple: Unsaved (User, Student); the student refers to the user
+    """
+    user = User(
+        username=session_data['username'],
+        email=session_data['email'],
+        first_name=session_data['first_name'],
+        last_name=session_data['last_name'],
+        password=make_password(session_data['password1'])
+    )
+    
+    county_id = session_data.get('county_id')
+    if county_id not in county_ids:
+        county_id = None
+    
+    student = Student(
+        user=user,
+        first_name=session_data['first_name'],
+        last_name=session_data['last_name'],
+        other_names=session_data.get('other_names', ''),
+        date_of_birth=session_data['date_of_birth'],
+        gender=session_data['gender'],
+        national_id=session_data['national_id'],
+        phone_number=session_data['phone_number'],
+        alternative_phone=session_data.get('alternative_phone', ''),
+        email=session_data['email'],
+        county_id=county_id,
+        sub_county=session_data['sub_county'],
+        ward=session_data['ward'],
+        location=session_data.get('location', ''),
+        current_education_level=session_data['current_education_level'],
+        current_institution=session_data['current_institution'],
+        course_of_study=session_data['course_of_study'],
+        year_of_study=session_data['year_of_study'],
+        expected_graduation_year=session_data['expected_graduation_year'],
+        previous_gpa=session_data.get('previous_gpa'),
+        previous_percentage=session_data.get('previous_percentage'),
+        family_income_annual=session_data['family_income_annual'],
+        number_of_dependents=session_data['number_of_dependents'],
+        is_orphan=session_data.get('is_orphan', False),
+        is_single_parent_child=session_data.get('is_single_parent_child', False),
+        is_child_headed_household=session_data.get('is_child_headed_household', False),
+        disability_status=session_data.get('disability_status', 'none'),
+        is_verified=False  # Will be verified later
+    )
+    return user, student
+
+
+def bulk_complete_registrations(session_datas):
+    """
+    Create accounts for many completed onboardings at once, e.g. a whole
+    class registered by a school.
+    
+    Users and students are each inserted with batched bulk_create calls in
+    one transaction instead of two INSERTs per registration.
+    
+    Args:
+        session_datas: Iterable of onboarding data dicts, as collected by
+            StudentOnboardingView
+        
+    Returns:
+        list: The saved Student objects
+    """
+    county_ids = {county.id for county in County.get_cached_list()}
+    registrations = [build_registration(data, county_ids) for data in session_datas]
+    
+    with transaction.atomic():
+        # Users get their primary keys back from bulk_create, so the
+        # students can refer to them directly
+        User.objects.bulk_create(
+            [user for user, _ in registrations], batch_size=BULK_BATCH_SIZE
+        )
+        students = [student for _, student in registrations]
+        for student in students:
+            # bulk_create skips save(), which normally fills this in
+            student.profile_completion = student.calculate_profile_completion()
+        students = Student.objects.bulk_create(students, batch_size=BULK_BATCH_SIZE)
+    
+    # bulk_create sends no post_save, so clear cached uniqueness lookups here
+    cache.delete_many([
+        Student.taken_cache_key(field, getattr(student, field))
+        for student in students
+        for field in ('national_id', 'phone_number')
+    ])
+    return students
+
+
+def build_step_contexts(form_classes, step_config):
+    """
+    Precompute the template context that only depends on the current step.
+    
+    Args:
+        form_classes: Dict of step number to form class
+        step_config: Dict of step number to title, description, icon and
+            progress
+        
+    Returns:
+        dict: Step number to a read-only context mapping
+    """
+    total_steps = len(form_classes)
+    return {
+        step: MappingProxyType({
+            'current_step': step,
+            'total_steps': total_steps,
+            'step_config': step_config[step],
+            'all_steps': step_config,
+            'is_final_step': step == total_steps,
+            'progress_percentage': step_config[step]['progress'],
+            'page_title': f'Registration - {step_config[step]["title"]}',
+            # For navigation
+            'can_go_back': step > 1,
+            'next_step': step + 1 if step < total_steps else None,
+            'prev_step': step - 1 if step > 1 else None,
+        })
+        for step in form_classes
+    }
+
+
 @method_decorator(csrf_protect, name='dispatch')
 class StudentOnboardingView(View):
     """
@@ -82,6 +219,9 @@ class StudentOnboardingView(View):
         }
     }
     
+    # Step-dependent template context, built once for the class
+    step_contexts = build_step_contexts(form_classes, step_config)
+    
     def get(self, request):
         """Handle GET request - display current step"""
         current_step = self.get_current_step(request)
@@ -96,7 +236,7 @@ class StudentOnboardingView(View):
         
         # Pre-populate form with session data
         initial_data = self.get_session_data(request)
-        form = form_class(initial=initial_data)
+        form = form_class(initial=initial_data, **self.get_form_kwargs(current_step))
         
         # Get progress form for hidden fields
         progress_form = OnboardingProgressForm(initial={
@@ -118,25 +258,23 @@ class StudentOnboardingView(View):
         
         # Get form class for current step
         form_class = self.form_classes[current_step]
-        form = form_class(request.POST, request.FILES)
+        form = form_class(request.POST, request.FILES, **self.get_form_kwargs(current_step))
         
         # Get progress form
         progress_form = OnboardingProgressForm(request.POST)
         
         if form.is_valid():
             # Save form data to session
+            # together with the step to move to, in a single session update
             form_data = form.cleaned_data
-            self.save_step_data(request, current_step, form_data)
+            step_context = self.step_contexts[current_step]
+            self.save_step_data(request, current_step, form_data, step_context['next_step'])
             
             # Check if this is the final step
-            if current_step == 5:
+            if step_context['is_final_step']:
                 # Create user and student profile
-                return self.complete_registration(request)
+                return self.complete_registration(request, form_data.get('profile_photo'))
             else:
-                # Move to next step
-                next_step = current_step + 1
-                self.set_current_step(request, next_step)
-                
                 messages.success(
                     request,
                     f'Step {current_step} completed successfully!'
@@ -159,90 +297,76 @@ class StudentOnboardingView(View):
         
         return render(request, self.template_name, context)
     
+    @classmethod
+    def get_form_kwargs(cls, step):
+        """Extra keyword arguments for the form of a step"""
+        if step == 2:
+            # The county dropdown renders and validates from the cached list
+            return {'county_queryset': County.get_cached_list()}
+        return {}
+    
+    @classmethod
+    def validate_steps(cls, steps):
+        """
+        Validate a whole onboarding at once with the forms of every step.
+        
+        Args:
+            steps: Dict of step number (as a string) to that step's form data
+            
+        Returns:
+            tuple: (registration data ready for build_registration, dict of
+                step number to form errors; empty when every step is valid)
+        """
+        registration_data = {}
+        errors = {}
+        for step, form_class in cls.form_classes.items():
+            form = form_class(steps.get(str(step)) or {}, **cls.get_form_kwargs(step))
+            if form.is_valid():
+                registration_data.update(form.cleaned_data)
+            else:
+                errors[step] = form.errors.get_json_data()
+        
+        county = registration_data.get('county')
+        registration_data['county_id'] = county.id if county else None
+        return registration_data, errors
+    
     def get_current_step(self, request):
         """Get current step from session or default to 1"""
         return request.session.get(f'{self.session_key}_step', 1)
     
-    def set_current_step(self, request, step):
-        """Set current step in session"""
-        request.session[f'{self.session_key}_step'] = step
-    
     def get_session_data(self, request):
         """Get all collected data from session"""
         return request.session.get(self.session_key, {})
     
-    def save_step_data(self, request, step, data):
-        """Save step data to session"""
+    def save_step_data(self, request, step, data, next_step=None):
+        """Save step data, and the step to continue from if given, to session"""
         session_data = self.get_session_data(request)
-        session_data.update(data)
+        for name, value in data.items():
+            # Uploads can't be stored; the final step hands them over directly
+            if isinstance(value, File):
+                continue
+            # Keep only JSON types so the session serializer can write it
+            if isinstance(value, models.Model):
+                value = value.pk
+            elif isinstance(value, (date, Decimal)):
+                value = str(value)
+            session_data[name] = value
         
         # Handle special cases for foreign keys
         if 'county' in data and data['county']:
             session_data['county_id'] = data['county'].id
         
         request.session[self.session_key] = session_data
+        if next_step is not None:
+            request.session[f'{self.session_key}_step'] = next_step
         request.session.modified = True
     
-    def complete_registration(self, request):
+    def complete_registration(self, request, profile_photo=None):
         """Complete the registration process by creating User and Student"""
         try:
             # Get all collected data
             session_data = self.get_session_data(request)
-            
-            # Create User account
-            user = User.objects.create(
-                username=session_data['username'],
-                email=session_data['email'],
-                first_name=session_data['first_name'],
-                last_name=session_data['last_name'],
-                password=make_password(session_data['password1'])
-            )
-            
-            # Get county object
-            county = None
-            if session_data.get('county_id'):
-                try:
-                    county = County.objects.get(id=session_data['county_id'])
-                except County.DoesNotExist:
-                    pass
-            
-            # Create Student profile
-            student = Student.objects.create(
-                user=user,
-                first_name=session_data['first_name'],
-                last_name=session_data['last_name'],
-                other_names=session_data.get('other_names', ''),
-                date_of_birth=session_data['date_of_birth'],
-                gender=session_data['gender'],
-                national_id=session_data['national_id'],
-                phone_number=session_data['phone_number'],
-                alternative_phone=session_data.get('alternative_phone', ''),
-                email=session_data['email'],
-                county=county,
-                sub_county=session_data['sub_county'],
-                ward=session_data['ward'],
-                location=session_data.get('location', ''),
-                current_education_level=session_data['current_education_level'],
-                current_institution=session_data['current_institution'],
-                course_of_study=session_data['course_of_study'],
-                year_of_study=session_data['year_of_study'],
-                expected_graduation_year=session_data['expected_graduation_year'],
-                previous_gpa=session_data.get('previous_gpa'),
-                previous_percentage=session_data.get('previous_percentage'),
-                family_income_annual=session_data['family_income_annual'],
-                number_of_dependents=session_data['number_of_dependents'],
-                is_orphan=session_data.get('is_orphan', False),
-                is_single_parent_child=session_data.get('is_single_parent_child', False),
-                is_child_headed_household=session_data.get('is_child_headed_household', False),
-                disability_status=session_data.get('disability_status', 'none'),
-                special_needs_description=session_data.get('special_needs_description', ''),
-                profile_photo=session_data.get('profile_photo'),
-                is_verified=False,  # Will be verified later
-                created_at=timezone.now()
-            )
-            
-            # Log in the user with specified backend
-            login(request, user, backend='scholarships.backends.MultiFieldAuthBackend')
+            user = self.create_account(request, session_data, profile_photo)
             
             # Clear session data
             self.clear_session_data(request)
@@ -268,28 +392,83 @@ class StudentOnboardingView(View):
             # Return to current step
             return redirect('scholarships:student_onboarding')
     
+    def create_account(self, request, registration_data, profile_photo=None):
+        """
+        Create the User and Student for a finished onboarding and log in.
+        
+        Args:
+            request: Current request, used to log the new user in
+            registration_data: Data collected by the onboarding steps
+            profile_photo: Optional uploaded photo for the profile
+            
+        Returns:
+            User: The saved, logged in user
+        """
+        county_ids = {county.id for county in County.get_cached_list()}
+        user, student = build_registration(registration_data, county_ids)
+        student.profile_photo = profile_photo
+        
+        # User and profile are created together or not at all, in one commit
+        with transaction.atomic():
+            user.save()
+            student.save()
+        
+        # Log in the user with specified backend
+        login(request, user, backend='scholarships.backends.MultiFieldAuthBackend')
+        return user
+    
     def clear_session_data(self, request):
         """Clear onboarding session data"""
-        if self.session_key in request.session:
-            del request.session[self.session_key]
-        if f'{self.session_key}_step' in request.session:
-            del request.session[f'{self.session_key}_step']
-        request.session.modified = True
+        request.session.pop(self.session_key, None)
+        request.session.pop(f'{self.session_key}_step', None)
     
     def get_context_data(self, form, progress_form, current_step):
         """Prepare context data for template"""
         return {
             'form': form,
             'progress_form': progress_form,
-            'current_step': current_step,
-            'total_steps': len(self.form_classes),
-            'step_config': self.step_config[current_step],
-            'all_steps': self.step_config,
-            'is_final_step': current_step == len(self.form_classes),
-            'progress_percentage': self.step_config[current_step]['progress'],
-            'page_title': f'Registration - {self.step_config[current_step]["title"]}',
-            # For navigation
-            'can_go_back': current_step > 1,
-            'next_step': current_step + 1 if current_step < len(self.form_classes) else None,
-            'prev_step': current_step - 1 if current_step > 1 else None,
+            **self.step_contexts[current_step],
         }
+
+
+class StudentOnboardingSubmitView(StudentOnboardingView):
+    """
+    Single-request onboarding for clients that run the wizard in the browser.
+    
+    Accepts one JSON body keyed by step number, e.g.
+    {"1": {...}, "2": {...}, ..., "5": {...}}, validates every step with
+    the same forms as StudentOnboardingView and creates the account when
+    all of them pass. Nothing is kept in the session between steps.
+    """
+    
+    http_method_names = ['post']
+    
+    def post(self, request):
+        """Validate all steps and create the account"""
+        if request.user.is_authenticated:
+            return JsonResponse({'success': False, 'error': 'Already registered'}, status=400)
+        
+        try:
+            payload = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({'success': False, 'error': 'Invalid JSON'}, status=400)
+        if not isinstance(payload, dict):
+            return JsonResponse({'success': False, 'error': 'Invalid JSON'}, status=400)
+        
+        registration_data, errors = self.validate_steps(payload)
+        if errors:
+            return JsonResponse({'success': False, 'errors': errors}, status=400)
+        
+        try:
+            user = self.create_account(request, registration_data)
+        except Exception as e:
+            return JsonResponse(
+                {'success': False, 'error': f'An error occurred while creating your account: {str(e)}'},
+                status=500
+            )
+        
+        return JsonResponse({
+            'success': True,
+            'message': f'Welcome {user.first_name}! Your account has been created successfully.',
+            'redirect_url': reverse('scholarships:student_dashboard'),
+        })
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
 import environ
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -40,6 +41,9 @@ DEBUG = env('DEBUG')
 
 ALLOWED_HOSTS = env('ALLOWED_HOSTS')
 
+# True while the test suite is running (manage.py test or pytest)
+TESTING = sys.argv[1:2] == ['test'] or 'pytest' in sys.modules
+
 
 # Application definition
 
@@ -101,6 +105,10 @@ DATABASES = {
     'default': env.db()
 }
 
+# Reuse connections across requests instead of reconnecting every time
+DATABASES['default']['CONN_MAX_AGE'] = env.int('CONN_MAX_AGE', default=600)
+DATABASES['default']['CONN_HEALTH_CHECKS'] = True
+
 # Alternative database configuration if you prefer individual settings
 # DATABASES = {
 #     'default': {
@@ -174,6 +182,25 @@ LOGIN_URL = '/auth/login/'
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/'
 
+# Per-view cache: bump the version when cached page markup changes shape
+CACHE_MIDDLEWARE_KEY_PREFIX = 'scholarships:v1'
+
+# REST framework: JSON responses are encoded with orjson
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'scholarships.renderers.OrjsonRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
+# Session Configuration
+SESSION_SERIALIZER = 'scholarships.session_serializers.OrjsonSerializer'
+if TESTING:
+    # Test sessions live in the signed cookie, so reading them needs no store
+    SESSION_ENGINE = 'django.contrib.sessions.backends.signed_cookies'
+    # Test passwords protect nothing; a slow hash only slows down the suite
+    PASSWORD_HASHERS = ['django.contrib.auth.hashers.MD5PasswordHasher']
+
 # Email Configuration
 if env('EMAIL_HOST', default=None):
     EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
@@ -20,14 +20,22 @@ ALLOWED_HOSTS = [
 DATABASE_URL = os.environ.get('DATABASE_URL')
 
 if DATABASE_URL and DATABASE_URL.strip() and not DATABASE_URL.startswith('://'):
-    # Valid DATABASE_URL provided
+    # Valid DATABASE_URL provided (point it at PgBouncer's port when PGBOUNCER is set)
+    PGBOUNCER = os.environ.get('PGBOUNCER', '').lower() in ('1', 'true', 'yes')
     DATABASES = {
         'default': dj_database_url.parse(
             DATABASE_URL,
-            conn_max_age=600,
-            conn_health_checks=True,
+            # PgBouncer does the pooling, so workers release their connection
+            # after each request instead of each holding a Postgres backend
+            conn_max_age=0 if PGBOUNCER else 600,
+            conn_health_checks=not PGBOUNCER,
         )
     }
+    
+    # Behind PgBouncer in transaction pooling mode a cursor can outlive the
+    # server connection it was opened on, so server-side cursors must be off
+    if PGBOUNCER:
+        DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
 else:
     # Fallback to SQLite for build process or when DATABASE_URL is not properly set
     DATABASES = {
@@ -37,12 +45,35 @@ else:
         }
     }
 
+# Password hashing: new and re-hashed passwords use Argon2id; existing
+# PBKDF2 hashes still verify and are upgraded on their next login
+PASSWORD_HASHERS = [
+    'scholarships.hashers.TunedArgon2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2PasswordHasher',
+]
+
 # Static Files Configuration
 STATIC_URL = '/static/'
 STATIC_ROOT = os.path.join(BASE_DIR, 'staticfiles')
 
-# Use WhiteNoise for static file serving
-STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
+# Static files come from a CDN-fronted bucket when one is configured, so
+# asset requests never reach a gunicorn worker. Otherwise WhiteNoise serves
+# them, with the Brotli and gzip copies it writes at collectstatic.
+AWS_STORAGE_BUCKET_NAME = os.environ.get('AWS_STORAGE_BUCKET_NAME')
+
+if AWS_STORAGE_BUCKET_NAME:
+    # Credentials are read by boto3 from AWS_ACCESS_KEY_ID and
+    # AWS_SECRET_ACCESS_KEY; AWS_S3_ENDPOINT_URL allows S3-compatible stores
+    STATICFILES_STORAGE = 'storages.backends.s3boto3.S3ManifestStaticStorage'
+    AWS_S3_ENDPOINT_URL = os.environ.get('AWS_S3_ENDPOINT_URL')
+    AWS_S3_CUSTOM_DOMAIN = os.environ.get('AWS_S3_CUSTOM_DOMAIN')  # CDN host
+    AWS_LOCATION = 'static'
+    AWS_DEFAULT_ACL = None
+    AWS_QUERYSTRING_AUTH = False
+    # Manifest names carry a content hash, so they can be cached for good
+    AWS_S3_OBJECT_PARAMETERS = {'CacheControl': 'public, max-age=31536000, immutable'}
+else:
+    STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 
 # Media Files Configuration
 MEDIA_URL = '/media/'
@@ -65,13 +96,35 @@ CSRF_TRUSTED_ORIGINS = [
     'https://*.onrender.com',
 ]
 
-# Cache Configuration (Optional - using database cache for simplicity)
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
-        'LOCATION': 'cache_table',
+# Cache Configuration
+# Redis is provisioned in render.yaml. The database cache is only a fallback
+# for deployments without it: every hit is a query on cache_table, but it is
+# still shared by all gunicorn workers, which the version-key invalidation
+# relies on (a per-process LocMemCache would not be).
+REDIS_URL = os.environ.get('REDIS_URL')
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': REDIS_URL,
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+                # Fail fast instead of hanging a worker if Redis stalls
+                'SOCKET_CONNECT_TIMEOUT': 2,
+                'SOCKET_TIMEOUT': 2,
+                # Connections are pooled per worker process and reused
+                'CONNECTION_POOL_KWARGS': {'max_connections': 50},
+            },
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'cache_table',
+        }
     }
-}
 
 # Email Configuration
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
@@ -128,6 +181,15 @@ if 'django_debug_toolbar' in INSTALLED_APPS:
 MIDDLEWARE = [mw for mw in MIDDLEWARE if 'debug_toolbar' not in mw]
 
 # Session Configuration
+# With Redis, sessions live only in the cache: SESSION_SAVE_EVERY_REQUEST
+# would otherwise also write django_session on every request (e.g. each
+# onboarding step). Without Redis the cache is the database anyway, so
+# cached_db keeps sessions durable there.
+if REDIS_URL:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
+else:
+    SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
+SESSION_CACHE_ALIAS = 'default'
 SESSION_COOKIE_AGE = 86400  # 24 hours
 SESSION_SAVE_EVERY_REQUEST = True
 SESSION_EXPIRE_AT_BROWSER_CLOSE = False
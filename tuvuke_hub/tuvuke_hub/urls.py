@@ -21,25 +21,33 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from django.shortcuts import redirect
+from django.utils.cache import patch_cache_control, patch_vary_headers
 from scholarships.admin import admin_site
-from scholarships.access_control import is_student, is_provider, is_staff_or_admin
+from scholarships.access_control import get_request_role
+
+# Where the root URL sends each role
+ROLE_HOME_URLS = {
+    'student': 'scholarships:student_dashboard',
+    'provider': 'scholarships:provider_dashboard',
+    'staff': 'scholarships:admin_dashboard',
+}
+
+# How long browsers and proxies may reuse the root redirect
+ANONYMOUS_HOME_MAX_AGE = 60 * 60
+USER_HOME_MAX_AGE = 60
 
 def home_redirect(request):
     """Redirect root URL based on user role"""
+    # Anonymous users and users without a specific role see scholarship listings
+    response = redirect(ROLE_HOME_URLS.get(get_request_role(request), 'scholarships:scholarship_list'))
+    # The target only changes on login or logout, and the session cookie changes
+    # with it, so the redirect can be reused as long as the cookie is the same
     if request.user.is_authenticated:
-        # Role-based redirection
-        if is_student(request.user):
-            return redirect('scholarships:student_dashboard')
-        elif is_provider(request.user):
-            return redirect('scholarships:provider_dashboard')
-        elif is_staff_or_admin(request.user):
-            return redirect('scholarships:admin_dashboard')
-        else:
-            # User is authenticated but has no specific role
-            return redirect('scholarships:scholarship_list')
+        patch_cache_control(response, private=True, max_age=USER_HOME_MAX_AGE)
     else:
-        # Unauthenticated users see scholarship listings
-        return redirect('scholarships:scholarship_list')
+        patch_cache_control(response, public=True, max_age=ANONYMOUS_HOME_MAX_AGE)
+    patch_vary_headers(response, ['Cookie'])
+    return response
 
 urlpatterns = [
     path("admin/", admin.site.urls),  # Default Django admin (staff only)